@@ -0,0 +1,319 @@
+"""
+여러 채널을 한 프로세스에서 동기화하는 채널 레지스트리 모듈
+
+channels.json(또는 CHANNEL_REGISTRY_FILE)에 채널 목록을 적으면 하나의 배포에서 N개 채널과
+재생목록을 동기화하고, 채널마다 별도의 스냅샷 파일(channels/<key>.json)과 통계 이력을 보관합니다.
+
+    {"channels": [
+        {"key": "haneul", "channel_id": "UC...", "podcast_playlist_id": "PL..."},
+        {"key": "another", "channel_id": "UC...", "data_file": "channels/another.sqlite3"}
+    ]}
+
+동기화는 세 단계로 이루어집니다.
+1. 채널별로 채널 정보, 업로드 재생목록의 새 동영상 ID, 팟캐스트 재생목록을 가져옵니다. (채널당 1~3회 호출, 병렬)
+2. 모든 채널의 새 동영상 ID와 통계를 갱신할 기존 동영상 ID를 모아 채널 구분 없이 50개씩 videos.list로 조회합니다.
+   채널마다 동영상이 몇 개뿐이어도 호출 수는 채널 수가 아니라 전체 ID 수에 비례합니다.
+3. 채널별 스냅샷을 저장하고, 썸네일 캐시는 모든 채널을 합쳐 한 번 갱신합니다.
+레지스트리 파일이 없으면 기존 설정(CHANNEL_ID, PODCAST_PLAYLIST_ID, DATA_FILE)의 채널 하나로 동작합니다.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import youtube_sync
+from snapshot_store import file_signature
+from stats_history import HISTORY_FILE
+from thumbnail_cache import sync_thumbnails
+
+REGISTRY_FILE = youtube_sync.get_secret("CHANNEL_REGISTRY_FILE", "channels.json")
+# 채널별 스냅샷·통계 이력을 보관하는 디렉터리
+CHANNEL_DATA_DIR = "channels"
+
+_registry_refresher_thread = None
+_registry_refresher_lock = threading.Lock()
+# (레지스트리 파일 서명, 채널 목록): 파일이 바뀔 때만 다시 파싱
+_registry_cache = None
+
+
+class ChannelConfig:
+    """레지스트리의 채널 하나입니다."""
+
+    def __init__(self, key, channel_id, podcast_playlist_id="", data_file=None, history_file=None):
+        self.key = key
+        self.channel_id = channel_id
+        self.podcast_playlist_id = podcast_playlist_id
+        self.data_file = data_file or os.path.join(CHANNEL_DATA_DIR, f"{key}.json")
+        self.history_file = history_file or os.path.join(CHANNEL_DATA_DIR, f"{key}.history.jsonl")
+
+    def __repr__(self):
+        return f"ChannelConfig({self.key!r}, {self.channel_id!r})"
+
+
+def default_channel():
+    """레지스트리가 없을 때 쓰는 기존 설정의 채널입니다."""
+    return ChannelConfig("default", youtube_sync.CHANNEL_ID, youtube_sync.PODCAST_PLAYLIST_ID,
+                         youtube_sync.DATA_FILE, HISTORY_FILE)
+
+
+def is_registry_enabled():
+    return os.path.exists(REGISTRY_FILE)
+
+
+def load_registry():
+    """레지스트리의 채널 목록을 반환합니다. 레지스트리 파일이 없거나 잘못되었으면 기본 채널 하나를 반환합니다.
+
+    파싱 결과는 파일의 수정 시각·크기가 바뀔 때까지 재사용합니다.
+    """
+    global _registry_cache
+    if not is_registry_enabled():
+        return [default_channel()]
+    signature = file_signature(REGISTRY_FILE)
+    cached = _registry_cache
+    if cached is not None and cached[0] == signature:
+        return list(cached[1])
+    try:
+        with open(REGISTRY_FILE, 'r', encoding='utf-8') as f:
+            entries = json.load(f).get("channels", [])
+        channels = [ChannelConfig(entry["key"], entry["channel_id"], entry.get("podcast_playlist_id", ""),
+                                  entry.get("data_file"), entry.get("history_file")) for entry in entries]
+    except (json.JSONDecodeError, OSError, KeyError, AttributeError) as e:
+        print(f"채널 레지스트리({REGISTRY_FILE})를 읽을 수 없어 기본 채널만 사용합니다: {e}")
+        channels = []
+    channels = channels or [default_channel()]
+    _registry_cache = (signature, channels)
+    return list(channels)
+
+
+def get_channel(key=None):
+    """key에 해당하는 채널을 반환합니다. key가 없거나 목록에 없으면 첫 번째 채널을 반환합니다."""
+    channels = load_registry()
+    for channel in channels:
+        if channel.key == key:
+            return channel
+    return channels[0]
+
+
+def _plan_channel(channel, etags, full, session):
+    """1단계: 채널 정보, 상세 정보가 필요한 새 동영상 ID, 팟캐스트 재생목록을 가져옵니다. 실패하면 None."""
+    cached_data = youtube_sync.load_channel_data(path=channel.data_file)
+    cached_videos = cached_data.get("videos", [])
+    cached_info = cached_data.get("channel_info") if "id" in cached_data.get("channel_info", {}) else None
+    channel_info = youtube_sync.get_channel_info(etags, cached_info, channel.channel_id)
+    if not channel_info:
+        print(f"[{channel.key}] 채널 정보를 가져올 수 없어 이 채널은 건너뜁니다.")
+        return None
+
+    uploads_playlist_id = youtube_sync.get_uploads_playlist_id(channel_info)
+    incremental = not full and bool(cached_videos)
+    if incremental:
+        sync_state = cached_data.get("sync_state") or youtube_sync.get_sync_state(cached_videos)
+        known_ids = {v['details']['id'] for v in cached_videos}
+        new_ids = youtube_sync.get_new_uploads(uploads_playlist_id, known_ids, sync_state.get('last_published_at'), etags)
+    else:
+        new_ids = youtube_sync.get_new_uploads(uploads_playlist_id, set())
+    if new_ids is None:
+        print(f"[{channel.key}] 업로드 재생목록을 가져오지 못해 이 채널은 건너뜁니다.")
+        return None
+
+    podcast_items = []
+    if channel.podcast_playlist_id:
+        podcast_items = youtube_sync.get_playlist_videos(channel.podcast_playlist_id, etags,
+                                                         cached_data.get("podcast_videos") or None, session)
+    return {
+        "cached_data": cached_data,
+        "cached_details": {v['details']['id']: v['details'] for v in cached_videos},
+        "channel_info": channel_info,
+        "new_ids": new_ids,
+        "uploads_playlist_id": uploads_playlist_id,
+        "incremental": incremental,
+        "podcast_items": podcast_items,
+    }
+
+
+def sync_channels(channels=None, full=False):
+    """레지스트리의 채널을 한 번에 동기화하고 {채널 key: 저장된 데이터 또는 None}을 반환합니다.
+
+    full=True이면 채널마다 업로드 재생목록 전체를 훑어 목록과 통계를 모두 새로 가져옵니다.
+    """
+    channels = channels or load_registry()
+    etag_state = youtube_sync.load_etag_state()
+    etags = etag_state["etags"]
+    session = youtube_sync.get_http_session()
+
+    # 1. 채널별 정보·새 업로드·재생목록 (채널 사이에는 병렬)
+    with ThreadPoolExecutor(max_workers=youtube_sync.MAX_DETAIL_WORKERS) as executor:
+        plans = list(executor.map(lambda channel: _plan_channel(channel, etags, full, session), channels))
+
+    # 2. 모든 채널의 새 동영상 ID와 (증분이면) 통계를 갱신할 기존 동영상 ID를 채널 구분 없이 50개씩 묶어 상세 정보 조회
+    refresh_ids = [video_id for plan in plans if plan and plan["incremental"]
+                   for video_id in youtube_sync.stats_refresh_ids(plan["cached_data"].get("videos", []))]
+    new_ids = [video_id for plan in plans if plan for video_id in plan["new_ids"]]
+    all_ids = list(dict.fromkeys(refresh_ids + new_ids))
+    cached_details = {}
+    for plan in plans:
+        if plan:
+            cached_details.update(plan["cached_details"])
+    details = youtube_sync.get_video_details(all_ids, etags, cached_details) if all_ids else {}
+
+    # 3. 채널별 스냅샷 저장
+    results = {}
+    saved_all = True
+    for channel, plan in zip(channels, plans):
+        if plan is None:
+            results[channel.key] = None
+            saved_all = False
+            continue
+        new_videos = youtube_sync.new_upload_videos(plan["new_ids"], details, etags,
+                                                    plan["uploads_playlist_id"] if plan["incremental"] else None)
+        cached_videos = plan["cached_data"].get("videos", [])
+        videos = new_videos + youtube_sync.merge_video_details(cached_videos, details) if plan["incremental"] else new_videos
+        new_data = youtube_sync.build_snapshot(plan["channel_info"], videos, plan["podcast_items"])
+        os.makedirs(os.path.dirname(os.path.abspath(channel.data_file)), exist_ok=True)
+        saved = youtube_sync.commit_snapshot(channel.data_file, new_data, plan["cached_data"], etag_state,
+                                             session, history_path=channel.history_file, thumbnails=False)
+        results[channel.key] = saved
+        saved_all = saved_all and saved is not None
+
+    # 썸네일 캐시는 모든 채널의 썸네일을 합쳐 한 번에 갱신 (채널별로 하면 서로의 항목을 지우게 됨)
+    merged = {"videos": [], "podcast_videos": []}
+    for data in results.values():
+        if data:
+            merged["videos"] += data.get("videos", [])
+            merged["podcast_videos"] += data.get("podcast_videos", [])
+    try:
+        sync_thumbnails(merged, session)
+    except Exception as e:
+        print(f"썸네일 캐시를 갱신하지 못했습니다: {e}")
+
+    # 저장에 실패한 채널이 있으면 ETag를 남기지 않아 다음 동기화에서 전체 응답을 다시 받도록 함
+    # 쓰지 않은 ETag는 레지스트리의 모든 채널을 동기화했을 때만 정리 (일부만 동기화하면 나머지 채널의 ETag가 남아야 함)
+    if saved_all:
+        synced_all = {channel.key for channel in channels} >= {channel.key for channel in load_registry()}
+        youtube_sync.save_etag_state(etag_state, prune=synced_all)
+    return results
+
+
+def estimate_registry_cost(channels, full=False):
+    """레지스트리 동기화의 예상 할당량 사용량 (상세 조회는 채널을 합쳐 50개씩 묶이므로 따로 계산)."""
+    total = 0
+    for channel in channels:
+        data = youtube_sync.load_channel_data(path=channel.data_file)
+        strategy = "uploads" if full else "incremental"
+        total += youtube_sync.estimate_sync_cost(data, strategy) - youtube_sync.QUOTA_COSTS["videos"]
+    return total + youtube_sync.QUOTA_COSTS["videos"]
+
+
+def refresh_registry(full=False, wait=False, max_age=None):
+    """refresh_channel_data와 같은 잠금(single-flight)으로 레지스트리 전체를 동기화합니다.
+
+    갱신이 필요한 채널이 없으면 API를 호출하지 않고 저장된 데이터를 반환합니다.
+    다른 곳에서 이미 동기화 중이면(wait=False) None을 반환합니다.
+    """
+    timeout = youtube_sync.REFRESH_WAIT_SECONDS if wait else 0
+    lock = youtube_sync.get_refresh_lock()
+    if not lock.acquire(timeout=timeout):
+        return None
+    try:
+        if not youtube_sync.acquire_file_lock(timeout):
+            return None
+        failed = []
+        try:
+            channels = load_registry()
+            stale = [channel for channel in channels
+                     if full or youtube_sync.needs_update(youtube_sync.load_channel_data(path=channel.data_file), max_age)]
+            if not stale:
+                return {channel.key: youtube_sync.load_channel_data(path=channel.data_file) for channel in channels}
+            failed = stale
+            if youtube_sync.quota_remaining() < estimate_registry_cost(stale, full):
+                print(f"오늘 남은 API 할당량({youtube_sync.quota_remaining()})이 부족하여 동기화를 건너뜁니다.")
+                return None
+            results = {channel.key: youtube_sync.load_channel_data(path=channel.data_file) for channel in channels}
+            synced = sync_channels(stale, full=full)
+            failed = [channel for channel in stale if synced.get(channel.key) is None]
+            results.update(synced)
+            return results
+        finally:
+            # 실패한 채널은 실패 시각을 남겨 페이지가 대기 시간 동안 다시 동기화하지 않게 함
+            if failed:
+                youtube_sync.record_refresh_failure([channel.data_file for channel in failed])
+            youtube_sync.flush_quota_ledger()
+            youtube_sync.release_file_lock()
+    finally:
+        lock.release()
+
+
+def start_background_registry_refresh():
+    """stale-while-revalidate: 레지스트리 동기화를 데몬 스레드에서 시작합니다."""
+    if youtube_sync.is_refresh_running():
+        return False
+    threading.Thread(target=refresh_registry, name="channel-registry-refresh", daemon=True).start()
+    return True
+
+
+def run_registry_loop(interval_seconds, stop_event=None):
+    """interval_seconds마다 오래된 채널만 동기화하는 반복 루프입니다. (할당량이 적으면 간격을 늘림)"""
+    stop_event = stop_event or threading.Event()
+    max_age = timedelta(seconds=interval_seconds)
+    while not stop_event.is_set():
+        try:
+            refresh_registry(max_age=max_age)
+        except Exception as e:
+            print(f"채널 레지스트리 동기화 중 오류가 발생했습니다: {e}")
+        stop_event.wait(youtube_sync.next_refresh_delay(interval_seconds))
+
+
+def start_registry_refresher(interval_seconds=None):
+    """레지스트리 백그라운드 갱신 스레드를 프로세스당 하나만 시작합니다."""
+    global _registry_refresher_thread
+    with _registry_refresher_lock:
+        if _registry_refresher_thread is None or not _registry_refresher_thread.is_alive():
+            interval_seconds = interval_seconds or youtube_sync.REFRESH_INTERVAL_HOURS * 3600
+            _registry_refresher_thread = threading.Thread(target=run_registry_loop, args=(interval_seconds,),
+                                                          name="channel-registry-refresher", daemon=True)
+            _registry_refresher_thread.start()
+    return _registry_refresher_thread
+
+
+def main(argv=None):
+    """레지스트리의 모든 채널을 동기화하는 CLI 진입점입니다."""
+    parser = argparse.ArgumentParser(description="채널 레지스트리(channels.json)의 모든 채널을 동기화합니다.")
+    parser.add_argument("--full", action="store_true", help="채널마다 업로드 재생목록 전체를 다시 가져옵니다.")
+    parser.add_argument("--force", action="store_true", help="캐시가 최신이어도 동기화합니다.")
+    parser.add_argument("--loop", action="store_true", help="종료하지 않고 --interval마다 반복 실행합니다.")
+    parser.add_argument("--interval", type=int, default=youtube_sync.REFRESH_INTERVAL_HOURS * 3600,
+                        help="반복 주기 및 캐시 유효 시간(초)")
+    args = parser.parse_args(argv)
+
+    if not youtube_sync.YOUTUBE_API_KEY:
+        print("YOUTUBE_API_KEY를 환경 변수나 .streamlit/secrets.toml에 설정해주세요.")
+        return 2
+
+    if args.loop:
+        try:
+            run_registry_loop(args.interval)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    started = time.monotonic()
+    max_age = timedelta(seconds=0) if args.force else timedelta(seconds=args.interval)
+    results = refresh_registry(full=args.full, wait=True, max_age=max_age)
+    if results is None:
+        print("동기화에 실패했거나 다른 프로세스가 동기화 중입니다.")
+        return 1
+    for key, data in results.items():
+        if data:
+            print(f"[{key}] 동영상 {len(data.get('videos', []))}개, 마지막 업데이트 {data.get('last_updated')}")
+        else:
+            print(f"[{key}] 동기화 실패")
+    print(f"완료 ({time.monotonic() - started:.1f}초)")
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
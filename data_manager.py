@@ -1,8 +1,11 @@
 import streamlit as st
 import json
-import os
 from datetime import datetime
 import pandas as pd
+from snapshot_store import load_snapshot, save_snapshot
+from channel_registry import get_channel
+from stats_history import DAY_SECONDS, load_history
+from video_catalog import format_duration
 
 # 페이지 설정
 st.set_page_config(
@@ -11,17 +14,22 @@ st.set_page_config(
     layout="wide"
 )
 
-# 데이터 파일 경로
-DATA_FILE = "channel_data.json"
+def get_current_channel():
+    """주소의 ?channel=<key>로 편집할 채널을 고릅니다.
 
-def load_channel_data():
+    채널 레지스트리가 없으면 기본 채널이고, 그 데이터 파일은 웹사이트·동기화와 같은 CHANNEL_DATA_FILE
+    (환경 변수 → Streamlit secrets, .db/.sqlite/.sqlite3로 끝나면 SQLite 저장소에 바뀐 행만 저장)입니다.
+    """
+    return get_channel(st.query_params.get("channel"))
+
+def load_channel_data(path):
     """채널 데이터 로드"""
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            st.error(f"데이터 파일을 읽는 중 오류가 발생했습니다: {e}")
+    try:
+        data = load_snapshot(path)
+        if data is not None:
+            return data
+    except Exception as e:
+        st.error(f"데이터 파일을 읽는 중 오류가 발생했습니다: {e}")
     
     # 기본 데이터 반환
     return {
@@ -36,16 +44,75 @@ def load_channel_data():
         "videos": []
     }
 
-def save_channel_data(data):
-    """채널 데이터 저장"""
+def save_channel_data(data, path):
+    """채널 데이터 저장 (임시 파일 + fsync + 원자적 교체로, 읽는 쪽이 잘린 파일을 보지 않도록 함)"""
     try:
-        with open(DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        save_snapshot(path, data, previous=data, indent=2)
         return True
     except Exception as e:
         st.error(f"데이터 파일을 저장하는 중 오류가 발생했습니다: {e}")
         return False
 
+def video_summary(video):
+    """동영상 항목을 표·통계에 쓰는 값으로 바꿉니다.
+
+    동기화로 만든 항목({"search_snippet", "details"})과 이 도구로 직접 입력한 항목을 모두 같은 키로 반환합니다.
+    """
+    details = video.get("details")
+    if not isinstance(details, dict):
+        return {
+            "title": video.get("title", ""),
+            "description": video.get("description", ""),
+            "published_at": video.get("published_at", ""),
+            "youtube_url": video.get("youtube_url", ""),
+            "duration": video.get("duration", ""),
+            "views": str(video.get("views", "0")),
+            "likes": str(video.get("likes", "0")),
+        }
+    snippet = video.get("search_snippet") or details.get("snippet") or {}
+    statistics = details.get("statistics", {})
+    return {
+        "title": snippet.get("title", ""),
+        "description": snippet.get("description", ""),
+        "published_at": snippet.get("publishedAt", ""),
+        "youtube_url": f"https://www.youtube.com/watch?v={details.get('id', '')}",
+        "duration": format_duration(details.get("contentDetails", {}).get("duration", "")),
+        "views": str(statistics.get("viewCount", "0")),
+        "likes": str(statistics.get("likeCount", "0")),
+    }
+
+def show_growth_history(data, history_path):
+    """동기화 때마다 기록된 채널의 통계 이력으로 성장 그래프와 이번 주 급상승 동영상을 표시합니다."""
+    st.subheader("📈 성장 추이")
+    history = load_history(history_path)
+    if not history.channel:
+        st.info("아직 기록된 통계 이력이 없습니다. 동기화가 실행되면 자동으로 기록됩니다.")
+        return
+    
+    days = st.selectbox("기간", [7, 30, 90, 365], index=1, format_func=lambda d: f"최근 {d}일")
+    end = history.channel[-1][0]
+    series = history.channel_series(end - days * DAY_SECONDS, end)
+    df = pd.DataFrame(
+        [values for _, values in series],
+        columns=["구독자", "동영상", "조회수"],
+        index=pd.to_datetime([t for t, _ in series], unit="s"),
+    )
+    st.line_chart(df[["구독자"]])
+    st.line_chart(df[["조회수"]])
+    
+    st.subheader("🔥 이번 주 급상승 동영상")
+    titles = {
+        (v.get("details") or {}).get("id", v.get("id")): (v.get("search_snippet") or v).get("title", "")
+        for v in data.get("videos", [])
+    }
+    trending = history.trending(days=7)
+    if trending:
+        st.dataframe(pd.DataFrame(
+            [{"제목": titles.get(video_id, video_id), "조회수 증가": gain} for video_id, gain in trending]
+        ), use_container_width=True)
+    else:
+        st.info("최근 7일 동안 조회수가 늘어난 동영상이 없습니다.")
+
 def main():
     st.title("⚙️ Haneul CCM Data Manager")
     st.markdown("채널 정보와 동영상 데이터를 관리하는 도구입니다.")
@@ -54,7 +121,8 @@ def main():
     tab1, tab2, tab3, tab4 = st.tabs(["📊 채널 정보", "🎬 동영상 관리", "📈 통계", "💾 데이터 내보내기"])
     
     # 데이터 로드
-    data = load_channel_data()
+    channel = get_current_channel()
+    data = load_channel_data(channel.data_file)
     
     with tab1:
         st.header("📊 채널 정보 관리")
@@ -95,7 +163,7 @@ def main():
                 "last_updated": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             })
             
-            if save_channel_data(data):
+            if save_channel_data(data, channel.data_file):
                 st.success("✅ 채널 정보가 성공적으로 저장되었습니다!")
     
     with tab2:
@@ -109,7 +177,7 @@ def main():
             
             # 동영상 테이블
             video_data = []
-            for i, video in enumerate(videos):
+            for i, video in enumerate(map(video_summary, videos)):
                 video_data.append({
                     "번호": i + 1,
                     "제목": video["title"],
@@ -161,7 +229,7 @@ def main():
                 data["channel_info"]["video_count"] = str(len(data["videos"]))
                 data["channel_info"]["last_updated"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 
-                if save_channel_data(data):
+                if save_channel_data(data, channel.data_file):
                     st.success("✅ 동영상이 성공적으로 추가되었습니다!")
                     st.rerun()
             else:
@@ -170,22 +238,22 @@ def main():
         # 동영상 삭제
         if videos:
             st.subheader("동영상 삭제")
-            video_titles = [v["title"] for v in videos]
+            video_titles = [video_summary(v)["title"] for v in videos]
             video_to_delete = st.selectbox("삭제할 동영상 선택", video_titles)
             
             if st.button("🗑️ 선택한 동영상 삭제"):
-                data["videos"] = [v for v in videos if v["title"] != video_to_delete]
+                data["videos"] = [v for v, title in zip(videos, video_titles) if title != video_to_delete]
                 data["channel_info"]["video_count"] = str(len(data["videos"]))
                 data["channel_info"]["last_updated"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 
-                if save_channel_data(data):
+                if save_channel_data(data, channel.data_file):
                     st.success("✅ 동영상이 성공적으로 삭제되었습니다!")
                     st.rerun()
     
     with tab3:
         st.header("📈 통계")
         
-        videos = data["videos"]
+        videos = [video_summary(v) for v in data["videos"]]
         
         if videos:
             col1, col2, col3, col4 = st.columns(4)
@@ -214,6 +282,8 @@ def main():
         
         else:
             st.info("등록된 동영상이 없습니다.")
+        
+        show_growth_history(data, channel.history_file)
     
     with tab4:
         st.header("💾 데이터 내보내기")
@@ -236,7 +306,7 @@ def main():
             if videos:
                 if st.button("📊 CSV 다운로드"):
                     video_data = []
-                    for video in videos:
+                    for video in map(video_summary, data["videos"]):
                         video_data.append({
                             "제목": video["title"],
                             "설명": video["description"],
@@ -0,0 +1,91 @@
+"""
+지연 import와 시작 시간 예산 점검 모듈
+
+requests(HTTP 클라이언트), Pillow, Firebase SDK 같은 무거운 패키지는 LazyModule로 감싸 두면
+속성에 처음 접근할 때(실제로 API를 호출하거나 예외를 처리할 때) import됩니다.
+캐시만 읽어 페이지를 그리는 재실행이나 컨테이너 재시작 직후의 첫 요청은 이 패키지들을 불러오지 않습니다.
+
+`python lazy_imports.py`는 새 인터프리터에서 페이지가 쓰는 모듈을 import하는 시간을 재고,
+(페이지가 먼저 불러오는 PRELOADED_MODULES는 시간을 재기 전에 import)
+IMPORT_TIME_BUDGET_MS를 넘거나 DEFERRED_MODULES가 미리 불러와지면 실패(종료 코드 1)합니다.
+"""
+import importlib
+import subprocess
+import sys
+import threading
+
+# 페이지(youtube_portfolio.py)가 시작할 때 import하는 프로젝트 모듈 (streamlit 제외)
+STARTUP_MODULES = (
+    "channel_registry",
+    "theme_css",
+    "visitor_counter",
+    "thumbnail_cache",
+    "video_cards",
+    "video_catalog",
+    "youtube_sync",
+)
+# 페이지가 프로젝트 모듈보다 먼저 import하므로 예산에 넣지 않는 패키지 (설치되어 있지 않으면 건너뜀)
+PRELOADED_MODULES = ("streamlit",)
+# 시작할 때 불러오면 안 되는 무거운/선택 패키지
+DEFERRED_MODULES = ("requests", "urllib3", "PIL", "firebase_admin", "isodate")
+# STARTUP_MODULES 전체의 import 시간 예산 (밀리초)
+IMPORT_TIME_BUDGET_MS = 60
+
+
+class LazyModule:
+    """속성에 처음 접근할 때 실제 모듈을 import하는 대리 객체입니다."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+_MEASURE_SCRIPT = """
+import sys, time
+for name in {preloaded!r}:
+    try:
+        __import__(name)
+    except ImportError:
+        pass
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = (time.perf_counter() - start) * 1000
+print(elapsed)
+print(",".join(name for name in {deferred!r} if name in sys.modules))
+"""
+
+
+def measure_startup_imports(modules=STARTUP_MODULES, deferred=DEFERRED_MODULES, preloaded=PRELOADED_MODULES):
+    """새 인터프리터에서 preloaded를 먼저 import한 뒤 modules를 import하는 시간(밀리초)과,
+    함께 불러와진 deferred 패키지 목록을 반환합니다."""
+    script = _MEASURE_SCRIPT.format(modules=tuple(modules), deferred=tuple(deferred), preloaded=tuple(preloaded))
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout.split("\n")
+    return float(output[0]), [name for name in output[1].split(",") if name]
+
+
+def main():
+    elapsed, loaded = measure_startup_imports()
+    print(f"시작 모듈 import 시간: {elapsed:.1f}ms (예산 {IMPORT_TIME_BUDGET_MS}ms)")
+    if loaded:
+        print(f"시작할 때 불러오면 안 되는 패키지가 import되었습니다: {', '.join(loaded)}")
+    return 0 if elapsed <= IMPORT_TIME_BUDGET_MS and not loaded else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+채널 스냅샷의 저장 형식(스키마) 모듈
+
+YouTube API 응답 중 페이지·데이터 관리 도구·동기화가 실제로 쓰는 필드만 남겨(필드 투영) 저장합니다.
+같은 필드 목록으로 API 요청의 `fields` 매개변수도 만들므로, 쓰지 않는 필드는 처음부터 내려받지 않습니다.
+
+저장 형식(SCHEMA_VERSION 2)에서 동영상 항목은 {"details": videos.list 항목}만 담고,
+details.snippet과 같은 내용인 search_snippet은 저장하지 않습니다. 읽을 때(unpack_snapshot)
+details.snippet으로 다시 만들어 붙이므로(문자열은 공유) 다른 모듈은 예전과 같은
+{"search_snippet", "details"} 형식을 그대로 씁니다.
+
+schema_version이 없는 이전 파일(버전 1)도 읽을 때 같은 형식으로 바뀌고, 다음 저장부터 새 형식으로 기록됩니다.
+바로 옮기려면 `python snapshot_schema.py migrate channel_data.json [새 경로]`를 실행합니다.
+(새 경로가 .json.gz이면 gzip JSON, .msgpack이면 msgpack으로 저장 — snapshot_store 참고)
+"""
+import argparse
+import sys
+
+SCHEMA_VERSION = 2
+
+# 필드 투영 규칙: {필드: None(값 전체 보관) 또는 하위 규칙}
+CHANNEL_FIELDS = {
+    "id": None,
+    "snippet": {"title": None, "description": None, "customUrl": None, "thumbnails": {"medium": None}},
+    "statistics": {"subscriberCount": None, "videoCount": None, "viewCount": None},
+    "contentDetails": {"relatedPlaylists": {"uploads": None}},
+}
+VIDEO_FIELDS = {
+    "id": None,
+    "snippet": {
+        "publishedAt": None,
+        "channelId": None,
+        "title": None,
+        "description": None,
+        "thumbnails": {"medium": None},
+        "channelTitle": None,
+        "tags": None,
+    },
+    "contentDetails": {"duration": None},
+    "statistics": {"viewCount": None, "likeCount": None, "commentCount": None},
+}
+PLAYLIST_ITEM_FIELDS = {
+    "id": None,
+    "snippet": {
+        "publishedAt": None,
+        "title": None,
+        "description": None,
+        "thumbnails": {"medium": None},
+        "resourceId": {"videoId": None},
+    },
+}
+# search API는 동영상 순서(ID)만 쓰고, 제목·설명 등은 videos.list 응답에서 가져옴
+SEARCH_ITEM_FIELDS = {"id": {"videoId": None}}
+# 업로드 재생목록은 증분 동기화 기준(ID, 게시 시각)만 사용
+UPLOAD_ITEM_FIELDS = {"contentDetails": {"videoId": None, "videoPublishedAt": None}}
+
+# search_snippet으로 다시 만들 details.snippet 필드 (search API snippet과 같은 구성)
+SEARCH_SNIPPET_KEYS = ("publishedAt", "channelId", "title", "description", "thumbnails", "channelTitle")
+
+
+def _selector(spec):
+    parts = []
+    for name, sub in spec.items():
+        parts.append(name if sub is None else f"{name}({_selector(sub)})")
+    return ",".join(parts)
+
+
+def fields_param(item_spec, paged=False):
+    """투영 규칙으로 YouTube API의 fields 매개변수 값을 만듭니다. (예: "etag,items(id,snippet(title))")"""
+    prefix = "etag,nextPageToken" if paged else "etag"
+    return f"{prefix},items({_selector(item_spec)})"
+
+
+def project(value, spec):
+    """투영 규칙에 있는 필드만 남긴 새 딕셔너리를 반환합니다. (규칙에 없는 필드는 버림)"""
+    if not isinstance(value, dict):
+        return value
+    projected = {}
+    for name, sub in spec.items():
+        if name in value:
+            projected[name] = value[name] if sub is None else project(value[name], sub)
+    return projected
+
+
+def search_snippet_from_details(details):
+    """videos.list 항목의 snippet으로 search API와 같은 형태의 search_snippet을 만듭니다."""
+    snippet = details.get('snippet', {})
+    return {key: snippet.get(key, {} if key == "thumbnails" else '') for key in SEARCH_SNIPPET_KEYS}
+
+
+def expand_video(details):
+    """저장된 details로 메모리 형식의 동영상 항목을 만듭니다."""
+    return {"search_snippet": search_snippet_from_details(details), "details": details}
+
+
+def _is_api_video(video):
+    """동기화로 만든 동영상 항목인지 확인합니다. (데이터 관리 도구로 직접 입력한 항목은 그대로 둠)"""
+    return isinstance(video, dict) and isinstance(video.get("details"), dict)
+
+
+def _video_details(video):
+    """동영상 항목의 details를 투영해 반환합니다.
+
+    details.snippet에 없는 값은 search_snippet에서 채웁니다. (상세 정보 없이 검색 결과만 저장했던
+    이전 파일에서 제목·설명을 잃지 않도록 함)
+    """
+    details = video["details"]
+    search_snippet = video.get("search_snippet")
+    if search_snippet:
+        # 빈 값은 search_snippet_from_details가 채운 기본값일 수 있으므로 옮기지 않음
+        snippet = {key: search_snippet[key] for key in SEARCH_SNIPPET_KEYS if search_snippet.get(key) not in (None, "", {})}
+        snippet.update(details.get("snippet") or {})
+        details = dict(details, snippet=snippet)
+    return project(details, VIDEO_FIELDS)
+
+
+def _is_api_channel(channel_info):
+    return isinstance(channel_info, dict) and "id" in channel_info and "snippet" in channel_info
+
+
+def normalize_snapshot(data):
+    """API 응답으로 만든 스냅샷을 투영된 메모리 형식으로 바꾼 새 딕셔너리를 반환합니다.
+
+    동영상의 search_snippet은 details.snippet에서 다시 만듭니다.
+    """
+    data = dict(data)
+    if _is_api_channel(data.get("channel_info")):
+        data["channel_info"] = project(data["channel_info"], CHANNEL_FIELDS)
+    if "videos" in data:
+        data["videos"] = [expand_video(_video_details(video)) if _is_api_video(video) else video
+                          for video in data["videos"]]
+    if "podcast_videos" in data:
+        data["podcast_videos"] = [project(item, PLAYLIST_ITEM_FIELDS) for item in data["podcast_videos"] or []]
+    return data
+
+
+def pack_snapshot(data):
+    """저장할 형식(SCHEMA_VERSION)으로 바꾼 새 딕셔너리를 반환합니다. data는 수정하지 않습니다.
+
+    스트리밍으로 읽을 때 레코드보다 먼저 형식을 알 수 있도록 schema_version을 맨 앞에 둡니다.
+    """
+    packed = {"schema_version": SCHEMA_VERSION}
+    packed.update((key, value) for key, value in data.items() if key != "schema_version")
+    if "videos" in packed:
+        packed["videos"] = [{"details": _video_details(video)} if _is_api_video(video) else video
+                            for video in packed["videos"]]
+    if _is_api_channel(packed.get("channel_info")):
+        packed["channel_info"] = project(packed["channel_info"], CHANNEL_FIELDS)
+    if packed.get("podcast_videos"):
+        packed["podcast_videos"] = [project(item, PLAYLIST_ITEM_FIELDS) for item in packed["podcast_videos"]]
+    return packed
+
+
+def check_schema_version(version):
+    """읽을 수 있는 형식 번호인지 확인합니다. 아니면 ValueError."""
+    if version not in (1, SCHEMA_VERSION):
+        raise ValueError(f"지원하지 않는 스냅샷 형식입니다: schema_version {version}")
+    return version
+
+
+def validate_video(video):
+    """저장된 동영상 레코드 하나를 검증합니다. 동기화 형식({"details": {"id": ...}})이 아니면 ValueError."""
+    if not _is_api_video(video):
+        raise ValueError("동영상 상세 정보(details)가 없습니다")
+    if not isinstance(video["details"].get("id"), str):
+        raise ValueError("동영상 ID가 없습니다")
+    search_snippet = video.get("search_snippet")
+    if search_snippet is not None and not isinstance(search_snippet, dict):
+        raise ValueError("search_snippet 형식이 올바르지 않습니다")
+
+
+def unpack_video(video, version=SCHEMA_VERSION):
+    """저장된 동영상 레코드 하나를 메모리 형식으로 바꿉니다. 버전 1은 이때 투영됩니다."""
+    if not _is_api_video(video):
+        return video
+    return expand_video(_video_details(video) if version == 1 else video["details"])
+
+
+def unpack_field(key, value, version=SCHEMA_VERSION):
+    """저장된 최상위 값 하나를 메모리 형식으로 바꿉니다. (스트리밍으로 읽을 때 사용)"""
+    if version == 1 and key == "channel_info" and _is_api_channel(value):
+        return project(value, CHANNEL_FIELDS)
+    return value
+
+
+def unpack_record(key, record, version=SCHEMA_VERSION):
+    """저장된 목록(videos, podcast_videos)의 항목 하나를 메모리 형식으로 바꿉니다. (스트리밍으로 읽을 때 사용)"""
+    if key == "videos":
+        return unpack_video(record, version)
+    if key == "podcast_videos" and version == 1:
+        return project(record, PLAYLIST_ITEM_FIELDS)
+    return record
+
+
+def unpack_snapshot(data):
+    """저장된 스냅샷(버전 1 또는 2)을 메모리 형식으로 바꿉니다. 버전 1은 이때 투영됩니다."""
+    if not isinstance(data, dict):
+        return data
+    version = check_schema_version(data.pop("schema_version", 1))
+    if version == 1:
+        return normalize_snapshot(data)
+    if "videos" in data:
+        data["videos"] = [unpack_video(video, version) for video in data["videos"]]
+    return data
+
+
+def main(argv=None):
+    from snapshot_store import load_snapshot, save_snapshot
+
+    parser = argparse.ArgumentParser(description="채널 스냅샷 파일을 현재 저장 형식으로 옮깁니다.")
+    parser.add_argument("command", choices=["migrate"])
+    parser.add_argument("path", help="기존 스냅샷 파일 (예: channel_data.json)")
+    parser.add_argument("output", nargs="?", help="저장할 경로 (생략하면 같은 파일, 예: channel_data.json.gz)")
+    args = parser.parse_args(argv)
+
+    data = load_snapshot(args.path)
+    if data is None:
+        print(f"{args.path} 파일이 없습니다.")
+        return 1
+    output = args.output or args.path
+    generation = save_snapshot(output, data, previous=data)
+    print(f"{args.path} → {output} 저장 완료 (schema_version {SCHEMA_VERSION}, generation {generation})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
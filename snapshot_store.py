@@ -0,0 +1,281 @@
+"""
+채널 데이터 스냅샷(channel_data.json) 저장/로드 모듈
+
+저장은 항상 '임시 파일에 쓰기 → fsync → os.replace' 순서로 이루어지므로, 동시에 파일을 읽는
+다른 세션은 이전 스냅샷이나 새 스냅샷 중 하나의 완전한 내용만 보게 됩니다.
+저장할 때마다 generation 번호를 1씩 올리고, 직전 스냅샷 몇 개를 `<파일명>.gen<번호>`로 남겨
+본 파일이 손상되었을 때 가장 최근의 정상 스냅샷으로 복구할 수 있게 합니다.
+
+JSON 파일은 snapshot_stream으로 조금씩 읽으며 동영상 레코드를 하나씩 변환하므로, 파일 전체를 문자열로
+올려 두지 않고, 잘린 파일은 그 위치에서 바로 오류가 납니다.
+
+load_snapshot_cached는 파싱(및 검증)한 스냅샷을 프로세스 메모리에 보관하고, 파일의
+수정 시각·크기·inode가 바뀐 경우에만 다시 읽으므로 Streamlit 재실행마다 JSON을 다시 파싱하지 않습니다.
+
+스냅샷은 snapshot_schema의 저장 형식(필요한 필드만, 중복 snippet 없음)으로 바꿔 저장하고,
+읽을 때 다시 메모리 형식으로 펼칩니다. 파일 인코딩은 경로의 확장자로 정합니다.
+- .json: 들여쓰기 없는 JSON (기본)
+- .json.gz: gzip으로 압축한 JSON
+- .msgpack: MessagePack (msgpack 패키지가 설치된 경우)
+
+경로가 .db/.sqlite/.sqlite3로 끝나면 같은 함수들이 SQLite 저장소(sqlite_store)를 사용합니다.
+이 경우 바뀐 행만 저장되고, 파일 서명 대신 저장소의 generation 번호로 변경 여부를 판단합니다.
+"""
+import gzip
+import json
+import os
+import re
+import tempfile
+import threading
+
+from snapshot_schema import check_schema_version, pack_snapshot, unpack_field, unpack_record, unpack_snapshot
+from snapshot_stream import iter_snapshot_events
+
+# 이 확장자의 경로는 SQLite 저장소(sqlite_store, 필요할 때만 import)를 사용
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+GZIP_SUFFIX = ".gz"
+MSGPACK_SUFFIX = ".msgpack"
+
+# 보관할 이전 스냅샷 개수
+SNAPSHOT_KEEP_GENERATIONS = 3
+
+# 경로별 (파일 서명, 파싱·검증 결과) 캐시. 모든 세션이 공유하므로 결과는 읽기 전용으로 다뤄야 함
+_snapshot_cache = {}
+_snapshot_cache_lock = threading.Lock()
+# 경로별 (파일 서명, JSON 값) 캐시 (스냅샷이 아닌 작은 상태 파일용)
+_json_cache = {}
+_json_cache_lock = threading.Lock()
+
+
+def is_sqlite_path(path):
+    """경로가 SQLite 저장소를 가리키는지(확장자 기준) 반환합니다."""
+    return str(path).lower().endswith(SQLITE_SUFFIXES)
+
+
+def _fsync_directory(directory):
+    """파일 교체(rename)가 디스크에 기록되도록 디렉터리를 fsync합니다. (Windows 등 미지원 환경은 무시)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_bytes_atomic(path, payload):
+    """같은 디렉터리의 임시 파일에 쓰고 fsync한 뒤 os.replace로 교체하여 원자적으로 저장합니다."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_directory(directory)
+
+
+def write_json_atomic(path, data, indent=None):
+    """JSON으로 원자적으로 저장합니다. (indent가 없으면 공백 없이 저장)"""
+    separators = None if indent is not None else (",", ":")
+    write_bytes_atomic(path, json.dumps(data, ensure_ascii=False, indent=indent, separators=separators).encode("utf-8"))
+
+
+def encode_snapshot(path, data, indent=None):
+    """경로의 확장자에 맞는 인코딩으로 스냅샷을 바이트열로 만듭니다."""
+    if path.endswith(MSGPACK_SUFFIX):
+        import msgpack
+
+        return msgpack.packb(data, use_bin_type=True)
+    separators = None if indent is not None else (",", ":")
+    payload = json.dumps(data, ensure_ascii=False, indent=indent, separators=separators).encode("utf-8")
+    if path.endswith(GZIP_SUFFIX):
+        # mtime=0: 내용이 같으면 압축 결과도 같도록 함
+        return gzip.compress(payload, compresslevel=6, mtime=0)
+    return payload
+
+
+def decode_snapshot(path, payload):
+    """encode_snapshot으로 만든 바이트열을 읽습니다. path는 형식을 정하는 원래 스냅샷 경로입니다."""
+    if path.endswith(MSGPACK_SUFFIX):
+        import msgpack
+
+        return msgpack.unpackb(payload, raw=False)
+    if path.endswith(GZIP_SUFFIX):
+        payload = gzip.decompress(payload)
+    return json.loads(payload)
+
+
+def list_generations(path):
+    """보관 중인 이전 스냅샷의 (generation, 경로) 목록을 최신순으로 반환합니다."""
+    directory = os.path.dirname(os.path.abspath(path))
+    pattern = re.compile(re.escape(os.path.basename(path)) + r"\.gen(\d+)$")
+    generations = []
+    if not os.path.isdir(directory):
+        return generations
+    for name in os.listdir(directory):
+        match = pattern.match(name)
+        if match:
+            generations.append((int(match.group(1)), os.path.join(directory, name)))
+    return sorted(generations, reverse=True)
+
+
+def _keep_previous_generation(path, generation):
+    """교체되기 직전의 스냅샷을 `<파일명>.gen<번호>`로 남기고, 오래된 것은 정리합니다."""
+    if generation <= 0 or not os.path.exists(path):
+        return
+    backup_path = f"{path}.gen{generation}"
+    try:
+        if os.path.exists(backup_path):
+            os.remove(backup_path)
+        os.link(path, backup_path)  # 하드 링크: 복사 없이 이전 내용을 그대로 보존
+    except OSError:
+        return  # 하드 링크를 지원하지 않는 파일 시스템에서는 보관을 건너뜀
+    for _, old_path in list_generations(path)[SNAPSHOT_KEEP_GENERATIONS:]:
+        try:
+            os.remove(old_path)
+        except OSError:
+            pass
+
+
+def save_snapshot(path, data, previous=None, indent=None):
+    """스냅샷을 새 generation 번호와 함께 원자적으로 저장하고, 그 번호를 반환합니다.
+
+    previous는 이 스냅샷의 바탕이 된(직전에 읽은) 데이터입니다. 새 번호는 previous와
+    보관 중인 스냅샷의 번호 중 가장 큰 값보다 1 크게 정해집니다.
+    저장 형식으로 바꾼 사본을 저장하며, data에는 새 generation 번호만 기록합니다.
+    """
+    packed = pack_snapshot(data)
+    if is_sqlite_path(path):
+        import sqlite_store
+        data["generation"] = sqlite_store.save_snapshot(path, packed, previous=previous)
+        return data["generation"]
+    current = (previous or {}).get("generation", 0)
+    kept = list_generations(path)
+    if kept:
+        current = max(current, kept[0][0])
+    _keep_previous_generation(path, current)
+    data["generation"] = packed["generation"] = current + 1
+    write_bytes_atomic(path, encode_snapshot(path, packed, indent=indent))
+    return data["generation"]
+
+
+def _snapshot_candidates(path):
+    """읽을 후보 파일: 본 파일, 보관된 이전 스냅샷(최신순)."""
+    return ([path] if os.path.exists(path) else []) + [p for _, p in list_generations(path)]
+
+
+def _iter_file(path, candidate):
+    """JSON 후보 파일 하나를 스트리밍으로 읽어 ("field", 키, 값)과 ("record", 목록 키, 항목)을 메모리 형식으로 내보냅니다."""
+    opener = gzip.open if path.endswith(GZIP_SUFFIX) else open
+    version = 1
+    with opener(candidate, 'rt', encoding='utf-8') as f:
+        for kind, key, value in iter_snapshot_events(f):
+            if kind == "field":
+                if key == "schema_version":
+                    version = check_schema_version(value)
+                    continue
+                yield kind, key, unpack_field(key, value, version)
+            else:
+                yield kind, key, unpack_record(key, value, version)
+
+
+def load_snapshot(path):
+    """스냅샷을 읽습니다. 본 파일이 손상되었으면 보관된 가장 최근의 정상 스냅샷을 읽습니다.
+
+    파일이 없으면 None을 반환하고, 모든 후보가 손상되었으면 마지막 오류를 그대로 발생시킵니다.
+    """
+    if is_sqlite_path(path):
+        import sqlite_store
+        return unpack_snapshot(sqlite_store.load_snapshot(path))
+    candidates = _snapshot_candidates(path)
+    if not candidates:
+        return None
+    error = None
+    for candidate in candidates:
+        try:
+            if path.endswith(MSGPACK_SUFFIX):
+                with open(candidate, 'rb') as f:
+                    return unpack_snapshot(decode_snapshot(path, f.read()))
+            data = {}
+            for kind, key, value in _iter_file(path, candidate):
+                if kind == "field":
+                    data[key] = value
+                else:
+                    data[key].append(value)
+            return data
+        except (ValueError, OSError, EOFError) as e:
+            error = e
+            print(f"스냅샷 파일({candidate})을 읽을 수 없습니다: {e}")
+    raise error
+
+
+def file_signature(path):
+    """파일이 바뀌었는지 판단하는 서명(수정 시각, 크기, inode)을 반환합니다. 파일이 없으면 None."""
+    if is_sqlite_path(path):
+        import sqlite_store
+        return sqlite_store.snapshot_signature(path)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def load_snapshot_cached(path, validate=None):
+    """load_snapshot 결과를 프로세스 전체에서 공유하며, 파일 서명이 바뀔 때만 다시 읽습니다.
+
+    validate가 주어지면 읽은 직후 한 번만 호출하고 그 반환값을 캐시합니다.
+    반환값은 여러 세션이 함께 쓰므로 호출한 쪽에서 수정하면 안 됩니다.
+    """
+    signature = file_signature(path)
+    with _snapshot_cache_lock:
+        entry = _snapshot_cache.get(path)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+    data = load_snapshot(path)
+    result = validate(data) if validate else data
+    with _snapshot_cache_lock:
+        _snapshot_cache[path] = (signature, result)
+    return result
+
+
+def load_json_cached(path, default=None):
+    """작은 JSON 상태 파일(ETag 상태, 썸네일 색인 등)을 읽고, 파일 서명이 바뀔 때까지 결과를 재사용합니다.
+
+    스냅샷 형식 변환이나 이전 세대 대체 없이 json.load만 합니다.
+    파일이 없거나 손상되었으면 default를 반환합니다. 반환값은 공유되므로 수정하지 마세요.
+    """
+    signature = file_signature(path)
+    if signature is None:
+        return default
+    with _json_cache_lock:
+        entry = _json_cache.get(path)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            value = json.load(f)
+    except (ValueError, OSError):
+        return default
+    with _json_cache_lock:
+        _json_cache[path] = (signature, value)
+    return value
+
+
+def clear_snapshot_cache(path=None):
+    """캐시를 비웁니다. path가 없으면 모든 경로의 캐시를 비웁니다."""
+    with _snapshot_cache_lock:
+        if path is None:
+            _snapshot_cache.clear()
+        else:
+            _snapshot_cache.pop(path, None)
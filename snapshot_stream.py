@@ -0,0 +1,159 @@
+"""
+채널 스냅샷 JSON 파일의 스트리밍 읽기 모듈
+
+json.load는 파일 전체를 문자열로 읽은 뒤 한 번에 파싱하므로, 최대 메모리가 파일 크기와 전체 객체 트리를 합친 만큼 듭니다.
+이 모듈은 파일을 READ_CHUNK_SIZE 단위로 읽으면서 최상위 객체를 키 하나씩, 레코드 목록(RECORD_KEYS)은
+항목 하나씩 파싱합니다. 버퍼에는 아직 파싱하지 않은 부분만 남기므로 메모리는 가장 큰 레코드 하나 정도로 제한되고,
+잘린 파일이나 잘못된 레코드는 그 위치에 도달하는 즉시 (몇 번째 레코드인지와 함께) 오류가 납니다.
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for kind, key, value in iter_snapshot_events(f):
+            ...   # ("field", 키, 값) 또는 ("record", 목록 키, 항목)
+
+텍스트 스트림이면 무엇이든 읽을 수 있으므로 .json.gz 파일은 gzip.open(..., 'rt')로 열어 넘깁니다.
+(스냅샷 형식 변환과 이전 세대 대체는 snapshot_store.load_snapshot, 파일 형식별로 여는 것은 snapshot_store._iter_file)
+"""
+import json
+import sys
+
+# 한 번에 읽을 문자 수
+READ_CHUNK_SIZE = 64 * 1024
+# 항목 하나씩 내보내는 최상위 목록
+RECORD_KEYS = ("videos", "podcast_videos")
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789eE.+-"
+# 파싱 오류 위치가 버퍼 끝에서 이만큼 안쪽이면 값이 잘렸을 수 있음 (true/false/null, \uXXXX 이스케이프, 숫자의 끝부분)
+_TRUNCATION_SLACK = 16
+
+
+def _intern_keys(pairs):
+    return {sys.intern(key): value for key, value in pairs}
+
+
+# 값마다 따로 파싱하면 json.load처럼 객체 키 문자열을 문서 전체에서 공유하지 못하므로 키를 intern
+_decoder = json.JSONDecoder(object_pairs_hook=_intern_keys)
+
+
+class SnapshotRecordError(ValueError):
+    """스냅샷의 레코드를 읽을 수 없거나 레코드가 올바르지 않을 때 발생합니다."""
+
+    def __init__(self, key, index, message):
+        super().__init__(f"{key}[{index}]: {message}")
+        self.key = key
+        self.index = index
+
+
+class _Reader:
+    """파싱하지 않은 부분만 버퍼에 남기며 JSON 값을 하나씩 읽습니다."""
+
+    def __init__(self, f, chunk_size=READ_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size=None):
+        """버퍼에 더 읽어 붙입니다. 이미 파싱한 앞부분은 버립니다. 더 읽을 것이 없으면 False."""
+        if self.eof:
+            return False
+        chunk = self.f.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """공백을 건너뛴 다음 문자를 반환합니다. (소비하지 않음) 파일 끝이면 빈 문자열."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            found = self.peek() or "파일 끝"
+            raise json.JSONDecodeError(f"'{char}'이(가) 필요하지만 {found!r}이(가) 있습니다", self.buffer, self.pos)
+        self.pos += 1
+
+    def _is_truncated(self, error):
+        """파싱 오류가 값이 버퍼 끝에서 잘려서 난 것일 수 있는지 확인합니다."""
+        # 닫는 따옴표 없이 버퍼 끝에 도달한 문자열은 시작 위치가 오류 위치로 보고됨
+        if error.msg.startswith("Unterminated string"):
+            return True
+        return len(self.buffer) - error.pos <= _TRUNCATION_SLACK
+
+    def value(self):
+        """다음 JSON 값 하나를 읽습니다. 값이 버퍼 끝에서 잘렸으면 더 읽어 다시 시도합니다."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # 버퍼 끝에서 잘린 경우에만 더 읽어 다시 시도 (그 밖의 오류는 뒤를 읽지 않고 바로 발생)
+                if not self._is_truncated(e):
+                    raise
+                # 버퍼에 남은 만큼 더 읽음 (큰 값도 읽기 횟수가 로그 수준으로 늘어남)
+                if not self._fill(max(self.chunk_size, len(self.buffer) - self.pos)):
+                    raise
+                continue
+            # 숫자는 끝 표시가 없으므로, 버퍼 끝까지 숫자 문자만 남았다면 이어지는 부분이 있을 수 있음 (예: "1" + "2e5")
+            tail = end
+            while tail < len(self.buffer) and self.buffer[tail] in _NUMBER_CHARS:
+                tail += 1
+            if tail == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_snapshot_events(f, record_keys=RECORD_KEYS, chunk_size=READ_CHUNK_SIZE):
+    """스냅샷 JSON을 읽으며 ("field", 키, 값)과 ("record", 목록 키, 항목)을 차례로 내보냅니다.
+
+    record_keys 목록은 시작할 때 ("field", 키, [])를 한 번 내보낸 뒤 항목마다 "record"를 내보냅니다.
+    chunk_size는 한 번에 읽을 문자 수입니다.
+    """
+    reader = _Reader(f, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("객체의 키는 문자열이어야 합니다", reader.buffer, reader.pos)
+        reader.expect(":")
+        if key in record_keys and reader.peek() == "[":
+            reader.expect("[")
+            yield "field", key, []
+            index = 0
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    try:
+                        record = reader.value()
+                    except json.JSONDecodeError as e:
+                        raise SnapshotRecordError(key, index, e.msg) from e
+                    yield "record", key, record
+                    index += 1
+                    if reader.peek() == ",":
+                        reader.pos += 1
+                        continue
+                    reader.expect("]")
+                    break
+        else:
+            yield "field", key, reader.value()
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("}")
+        break
+    if reader.peek():
+        raise json.JSONDecodeError("스냅샷 객체 뒤에 다른 내용이 있습니다", reader.buffer, reader.pos)
+
@@ -0,0 +1,317 @@
+"""
+채널 스냅샷의 SQLite 저장소
+
+스냅샷 경로가 .db/.sqlite/.sqlite3로 끝나면 snapshot_store가 JSON 파일 대신 이 모듈을 사용합니다.
+(youtube_sync의 CHANNEL_DATA_FILE 설정으로 선택)
+
+스냅샷은 채널(channels), 동영상(videos), 동영상 통계(video_stats), 재생목록 항목(playlist_items),
+그 밖의 최상위 값(meta) 테이블에 행 단위로 나뉘어 저장됩니다. 저장할 때는 행마다 내용 해시를 비교해
+바뀐 행만 쓰므로, 동기화나 데이터 관리 도구에서 동영상 몇 개가 바뀌어도 파일 전체를 다시 쓰지 않습니다.
+목록 위치는 끝에서부터 센 번호로 저장하여, 증분 동기화로 새 동영상이 앞에 붙어도 기존 행은 그대로입니다.
+
+행에는 snapshot_store가 넘긴 저장 형식(snapshot_schema) 그대로 보관하고, load_snapshot도 그 형식의
+딕셔너리를 돌려줍니다. (메모리 형식으로 펼치는 것은 snapshot_store.load_snapshot)
+웹사이트의 정렬·검색·분류는 메모리 카탈로그(video_catalog)가 처리하므로, 제목·통계 같은 열은 SQLite에서 직접 살펴볼 때 쓰는 값입니다.
+JSON 파일과의 변환은 `python sqlite_store.py import|export <JSON 파일> <DB 파일>`로 할 수 있습니다.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+
+import snapshot_store
+from video_catalog import parse_duration_seconds
+
+SQLITE_TIMEOUT = 30
+
+# 행으로 나누어 저장하는 최상위 키 (나머지 키는 meta 테이블에 JSON 그대로 저장)
+ROW_KEYS = ("channel_info", "videos", "podcast_videos")
+PLAYLIST_KEYS = ("podcast_videos",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS channels (
+    channel_id TEXT PRIMARY KEY,
+    title TEXT,
+    subscriber_count INTEGER,
+    video_count INTEGER,
+    view_count INTEGER,
+    data TEXT NOT NULL,
+    row_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    title TEXT,
+    description TEXT,
+    published_at TEXT,
+    duration_seconds INTEGER,
+    data TEXT NOT NULL,
+    row_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS video_stats (
+    video_id TEXT PRIMARY KEY REFERENCES videos(video_id) ON DELETE CASCADE,
+    view_count INTEGER,
+    like_count INTEGER,
+    comment_count INTEGER
+);
+CREATE TABLE IF NOT EXISTS playlist_items (
+    list_name TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    video_id TEXT,
+    data TEXT NOT NULL,
+    row_hash TEXT NOT NULL,
+    PRIMARY KEY (list_name, item_id)
+);
+CREATE INDEX IF NOT EXISTS idx_videos_position ON videos(position);
+"""
+
+def connect(path):
+    """스키마가 준비된 연결을 엽니다. WAL 모드라서 동기화 중에도 다른 세션이 읽을 수 있습니다."""
+    conn = sqlite3.connect(path, timeout=SQLITE_TIMEOUT)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def _row_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _to_int(value):
+    try:
+        return int(str(value).replace(",", ""))
+    except (TypeError, ValueError):
+        return None
+
+
+def _video_id(video):
+    """동기화 형식({"details": {...}})과 데이터 관리 도구 형식({"id": ...}) 모두에서 동영상 ID를 찾습니다."""
+    return (video.get("details") or {}).get("id") or video.get("id")
+
+
+def _video_columns(video):
+    """동영상 항목에서 열로 저장할 값(제목, 설명, 업로드 시각, 재생 시간(초))과 통계를 꺼냅니다."""
+    details = video.get("details") or {}
+    snippet = video.get("search_snippet") or details.get("snippet") or video
+    statistics = details.get("statistics") or {}
+    duration = (details.get("contentDetails") or {}).get("duration") or video.get("duration") or ""
+    columns = (
+        snippet.get("title", ""),
+        snippet.get("description", ""),
+        snippet.get("publishedAt") or video.get("published_at", ""),
+        parse_duration_seconds(duration),
+    )
+    stats = (
+        _to_int(statistics.get("viewCount", video.get("views"))),
+        _to_int(statistics.get("likeCount", video.get("likes"))),
+        _to_int(statistics.get("commentCount")),
+    )
+    return columns, stats
+
+
+def _item_id(item):
+    snippet = item.get("snippet") or {}
+    return item.get("id") or (snippet.get("resourceId") or {}).get("videoId")
+
+
+def _keyed(items, key_func):
+    """(키, 위치, 항목) 목록을 만듭니다. 위치는 끝에서부터 센 번호이고, 키가 없거나 겹치면 위치로 구분합니다."""
+    total = len(items)
+    seen = set()
+    keyed = []
+    for index, item in enumerate(items):
+        position = total - index
+        key = key_func(item) or f"#{position}"
+        if key in seen:
+            key = f"{key}#{position}"
+        seen.add(key)
+        keyed.append((key, position, item))
+    return keyed
+
+
+def _get_generation(conn):
+    row = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+    return json.loads(row[0]) if row else 0
+
+
+def _save_channel(conn, channel_info):
+    text = _dumps(channel_info)
+    row_hash = _row_hash(text)
+    channel_id = channel_info.get("id", "")
+    existing = conn.execute("SELECT channel_id, row_hash FROM channels").fetchall()
+    if existing == [(channel_id, row_hash)]:
+        return
+    statistics = channel_info.get("statistics") or channel_info
+    conn.execute("DELETE FROM channels WHERE channel_id != ?", (channel_id,))
+    conn.execute(
+        "INSERT OR REPLACE INTO channels VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (channel_id, (channel_info.get("snippet") or channel_info).get("title"),
+         _to_int(statistics.get("subscriberCount", statistics.get("subscriber_count"))),
+         _to_int(statistics.get("videoCount", statistics.get("video_count"))),
+         _to_int(statistics.get("viewCount", statistics.get("view_count"))),
+         text, row_hash),
+    )
+
+
+def _save_videos(conn, videos):
+    existing = {video_id: (position, row_hash) for video_id, position, row_hash
+                in conn.execute("SELECT video_id, position, row_hash FROM videos")}
+    keep = set()
+    for video_id, position, video in _keyed(videos, _video_id):
+        keep.add(video_id)
+        text = _dumps(video)
+        row_hash = _row_hash(text)
+        current = existing.get(video_id)
+        if current == (position, row_hash):
+            continue
+        if current is not None and current[1] == row_hash:
+            conn.execute("UPDATE videos SET position = ? WHERE video_id = ?", (position, video_id))
+            continue
+        columns, stats = _video_columns(video)
+        conn.execute(
+            "INSERT INTO videos VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(video_id) DO UPDATE SET position = excluded.position, title = excluded.title, "
+            "description = excluded.description, published_at = excluded.published_at, "
+            "duration_seconds = excluded.duration_seconds, data = excluded.data, row_hash = excluded.row_hash",
+            (video_id, position) + columns + (text, row_hash),
+        )
+        conn.execute("INSERT OR REPLACE INTO video_stats VALUES (?, ?, ?, ?)", (video_id,) + stats)
+    removed = [(video_id,) for video_id in existing if video_id not in keep]
+    conn.executemany("DELETE FROM videos WHERE video_id = ?", removed)
+
+
+def _save_playlist(conn, list_name, items):
+    existing = {item_id: (position, row_hash) for item_id, position, row_hash in conn.execute(
+        "SELECT item_id, position, row_hash FROM playlist_items WHERE list_name = ?", (list_name,))}
+    keep = set()
+    for item_id, position, item in _keyed(items, _item_id):
+        keep.add(item_id)
+        text = _dumps(item)
+        row_hash = _row_hash(text)
+        if existing.get(item_id) == (position, row_hash):
+            continue
+        video_id = ((item.get("snippet") or {}).get("resourceId") or {}).get("videoId")
+        conn.execute("INSERT OR REPLACE INTO playlist_items VALUES (?, ?, ?, ?, ?, ?)",
+                     (list_name, item_id, position, video_id, text, row_hash))
+    removed = [(list_name, item_id) for item_id in existing if item_id not in keep]
+    conn.executemany("DELETE FROM playlist_items WHERE list_name = ? AND item_id = ?", removed)
+
+
+def save_snapshot(path, data, previous=None):
+    """스냅샷을 한 트랜잭션으로 저장하되, 내용이 바뀐 행만 씁니다. 새 generation 번호를 반환합니다."""
+    conn = connect(path)
+    try:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            current = max((previous or {}).get("generation", 0), _get_generation(conn))
+            generation = current + 1
+            _save_channel(conn, data.get("channel_info") or {})
+            _save_videos(conn, data.get("videos") or [])
+            for list_name in PLAYLIST_KEYS:
+                _save_playlist(conn, list_name, data.get(list_name) or [])
+
+            # 나머지 최상위 값과 키 순서는 meta에 그대로 보관 (JSON 형식으로 손실 없이 내보내기 위함)
+            keys = [key for key in data if key != "generation"] + ["generation"]
+            meta = {"keys": keys, "generation": generation}
+            meta.update({f"field:{key}": data[key] for key in keys if key not in ROW_KEYS and key != "generation"})
+            stored = {key for (key,) in conn.execute("SELECT key FROM meta")}
+            conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                             [(key, _dumps(value)) for key, value in meta.items()])
+            conn.executemany("DELETE FROM meta WHERE key = ?", [(key,) for key in stored - set(meta)])
+    finally:
+        conn.close()
+    data["generation"] = generation
+    return generation
+
+
+def load_snapshot(path):
+    """저장소를 JSON 스냅샷과 같은 형식의 딕셔너리로 읽습니다. 파일이 없거나 비어 있으면 None."""
+    if not os.path.exists(path):
+        return None
+    conn = connect(path)
+    try:
+        meta = {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM meta")}
+        if "keys" not in meta:
+            return None
+        rows = {
+            "channel_info": next((json.loads(text) for (text,) in conn.execute("SELECT data FROM channels")), {}),
+            "videos": [json.loads(text) for (text,) in conn.execute("SELECT data FROM videos ORDER BY position DESC")],
+        }
+        for list_name in PLAYLIST_KEYS:
+            rows[list_name] = [json.loads(text) for (text,) in conn.execute(
+                "SELECT data FROM playlist_items WHERE list_name = ? ORDER BY position DESC", (list_name,))]
+    finally:
+        conn.close()
+
+    data = {}
+    for key in meta["keys"]:
+        if key == "generation":
+            data[key] = meta["generation"]
+        elif key in rows:
+            data[key] = rows[key]
+        else:
+            data[key] = meta.get(f"field:{key}")
+    return data
+
+
+def snapshot_signature(path):
+    """저장소가 바뀌었는지 판단하는 서명(generation)을 반환합니다. 파일이 없으면 None."""
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(path, timeout=SQLITE_TIMEOUT)
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+    except sqlite3.OperationalError:
+        row = None  # 아직 스키마가 없는 빈 파일
+    finally:
+        conn.close()
+    return ("sqlite", json.loads(row[0]) if row else 0)
+
+
+def import_json(json_path, db_path):
+    """JSON 스냅샷 파일(이전 형식, .json.gz 포함)을 SQLite 저장소로 가져오고 generation을 반환합니다."""
+    data = snapshot_store.load_snapshot(json_path)
+    if data is None:
+        raise FileNotFoundError(json_path)
+    return snapshot_store.save_snapshot(db_path, data, previous=data)
+
+
+def export_json(db_path, json_path, indent=None):
+    """SQLite 저장소를 JSON 스냅샷 파일(확장자에 따라 .json.gz 등)로 내보냅니다."""
+    data = load_snapshot(db_path)
+    if data is None:
+        raise FileNotFoundError(db_path)
+    snapshot_store.write_bytes_atomic(json_path, snapshot_store.encode_snapshot(json_path, data, indent=indent))
+    return data["generation"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="채널 스냅샷 JSON 파일 ↔ SQLite 저장소 변환")
+    parser.add_argument("command", choices=["import", "export"], help="import: JSON → SQLite, export: SQLite → JSON")
+    parser.add_argument("json_path", help="JSON 스냅샷 파일 (예: channel_data.json)")
+    parser.add_argument("db_path", help="SQLite 저장소 파일 (예: channel_data.sqlite3)")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        generation = import_json(args.json_path, args.db_path)
+        print(f"{args.json_path} → {args.db_path} 가져오기 완료 (generation {generation})")
+    else:
+        generation = export_json(args.db_path, args.json_path)
+        print(f"{args.db_path} → {args.json_path} 내보내기 완료 (generation {generation})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""
+채널·동영상 통계 이력 저장 모듈
+
+동기화할 때마다 채널 통계(구독자·동영상·조회수)와 동영상별 통계(조회수·좋아요·댓글)를
+이력 파일(stats_history.jsonl)에 한 줄씩 덧붙입니다. 각 줄에는 직전 기록과 달라진 값만 담기므로
+(델타 기록) 동영상이 많아도 한 번의 기록은 바뀐 동영상 수만큼만 커지고, 바뀐 것이 없으면 아무것도 쓰지 않습니다.
+
+    {"t": 1760000000, "c": [구독자, 동영상 수, 조회수], "v": {"동영상 ID": [조회수, 좋아요, 댓글]}}
+
+첫 줄과 정리(compact) 직후의 첫 줄은 전체 상태를 담은 기준 기록("k": 1)입니다.
+HISTORY_FULL_DAYS보다 오래된 기록은 하루에 하나(그날의 마지막 값)로 줄이고,
+HISTORY_RETENTION_DAYS보다 오래된 기록은 기준 기록에 합쳐 버립니다.
+정리는 날짜 단위로 하므로, 하루가 통째로 기간을 넘어갈 때(하루 한 번 정도)만 파일을 다시 씁니다.
+
+읽은 이력은 파일 서명이 바뀔 때까지 프로세스 메모리에 항목별 시계열(과 시각 배열)로 보관하므로,
+성장 그래프나 '이번 주 급상승' 순위 같은 구간 조회는 이분 탐색으로 처리됩니다.
+동기화 때 덧붙인 기록은 파일을 다시 읽지 않고 보관된 이력에 바로 합칩니다.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+
+from snapshot_store import file_signature, write_bytes_atomic
+
+HISTORY_FILE = "stats_history.jsonl"
+# 이 기간(일) 안의 기록은 모두 보관하고, 그보다 오래된 기록은 하루 하나로 줄임
+HISTORY_FULL_DAYS = 14
+# 이 기간(일)보다 오래된 기록은 기준 기록에 합쳐 버림
+HISTORY_RETENTION_DAYS = 365
+
+CHANNEL_FIELDS = ("subscriberCount", "videoCount", "viewCount")
+VIDEO_FIELDS = ("viewCount", "likeCount", "commentCount")
+
+DAY_SECONDS = 24 * 60 * 60
+
+# 경로별 (파일 서명, History) 캐시
+_history_cache = {}
+_history_lock = threading.Lock()
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def snapshot_stats(data):
+    """스냅샷에서 (채널 통계 리스트, {동영상 ID: 통계 리스트})를 꺼냅니다."""
+    statistics = data.get("channel_info", {}).get("statistics", {})
+    channel = [_to_int(statistics.get(field)) for field in CHANNEL_FIELDS]
+    videos = {}
+    for video in data.get("videos", []):
+        details = video.get("details") or {}
+        if "id" in details:
+            video_statistics = details.get("statistics", {})
+            videos[details["id"]] = [_to_int(video_statistics.get(field)) for field in VIDEO_FIELDS]
+    return channel, videos
+
+
+class History:
+    """이력 파일을 항목별 시계열로 펼친 것입니다.
+
+    - channel: [(시각, [구독자, 동영상 수, 조회수]), ...] (시각 오름차순)
+    - videos: {동영상 ID: [(시각, [조회수, 좋아요, 댓글]), ...]}
+    - records: 파일의 기록 목록 (정리할 때 사용)
+    시계열마다 시각만 모은 배열(channel_times, video_times)을 함께 보관해 구간 조회를 이분 탐색으로 처리합니다.
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self.channel = []
+        self.channel_times = []
+        self.videos = {}
+        self.video_times = {}
+        for record in records:
+            t = record["t"]
+            if "c" in record:
+                self.channel.append((t, record["c"]))
+                self.channel_times.append(t)
+            for video_id, values in record.get("v", {}).items():
+                self.videos.setdefault(video_id, []).append((t, values))
+                self.video_times.setdefault(video_id, []).append(t)
+
+    def appended(self, record):
+        """기록 하나를 덧붙인 새 History를 반환합니다. (공유 중인 이 객체는 바꾸지 않고, 바뀐 시계열만 복사)"""
+        history = History.__new__(History)
+        t = record["t"]
+        history.records = self.records + [record]
+        history.channel, history.channel_times = self.channel, self.channel_times
+        if "c" in record:
+            history.channel = self.channel + [(t, record["c"])]
+            history.channel_times = self.channel_times + [t]
+        history.videos = dict(self.videos)
+        history.video_times = dict(self.video_times)
+        for video_id, values in record.get("v", {}).items():
+            history.videos[video_id] = self.videos.get(video_id, []) + [(t, values)]
+            history.video_times[video_id] = self.video_times.get(video_id, []) + [t]
+        return history
+
+    def latest_state(self):
+        """가장 최근의 (채널 통계, {동영상 ID: 통계})를 반환합니다."""
+        channel = self.channel[-1][1] if self.channel else None
+        return channel, {video_id: series[-1][1] for video_id, series in self.videos.items()}
+
+    @staticmethod
+    def _value_at(series, times, t):
+        """시각 t 당시(그 이전의 마지막 기록)의 값. t 이전 기록이 없으면 None."""
+        index = bisect.bisect_right(times, t) - 1
+        return series[index][1] if index >= 0 else None
+
+    @staticmethod
+    def _range(series, times, start, end):
+        """start~end 구간의 기록. 구간 시작 시점의 값도 첫 점으로 포함합니다."""
+        lo = bisect.bisect_right(times, start) - 1 if start is not None else 0
+        hi = bisect.bisect_right(times, end) if end is not None else len(series)
+        points = series[max(lo, 0):hi]
+        if start is not None and points and points[0][0] < start:
+            points = [(start, points[0][1])] + points[1:]
+        return points
+
+    def channel_series(self, start=None, end=None):
+        return self._range(self.channel, self.channel_times, start, end)
+
+    def video_series(self, video_id, start=None, end=None):
+        return self._range(self.videos.get(video_id, []), self.video_times.get(video_id, []), start, end)
+
+    def trending(self, days=7, field="viewCount", limit=10, now=None):
+        """최근 days일 동안 field가 가장 많이 늘어난 동영상의 [(동영상 ID, 증가량), ...]을 반환합니다."""
+        now = now or time.time()
+        since = now - days * DAY_SECONDS
+        column = VIDEO_FIELDS.index(field)
+        gains = []
+        for video_id, series in self.videos.items():
+            before = self._value_at(series, self.video_times[video_id], since)
+            base = before[column] if before is not None else series[0][1][column]
+            gain = series[-1][1][column] - base
+            if gain > 0:
+                gains.append((video_id, gain))
+        gains.sort(key=lambda item: item[1], reverse=True)
+        return gains[:limit]
+
+
+def _read_records(path):
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # 쓰다가 중단된 마지막 줄 등은 건너뜀
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def load_history(path=HISTORY_FILE):
+    """이력을 History로 반환합니다. 파일이 바뀔 때만 다시 읽고, 결과는 공유되므로 수정하지 마세요."""
+    signature = file_signature(path)
+    with _history_lock:
+        entry = _history_cache.get(path)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+    history = History(_read_records(path))
+    with _history_lock:
+        _history_cache[path] = (signature, history)
+    return history
+
+
+def _append_line(path, record):
+    """기록 한 줄을 한 번의 write로 덧붙이고 fsync합니다. 쓴 바이트 수를 반환합니다."""
+    line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        written = os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    return written
+
+
+def record_snapshot_stats(data, path=HISTORY_FILE, now=None):
+    """스냅샷의 통계를 직전 기록과 비교해 바뀐 값만 덧붙입니다. 기록했으면 True.
+
+    필요하면 덧붙인 뒤 오래된 기록을 정리합니다.
+    """
+    now = int(now or time.time())
+    channel, videos = snapshot_stats(data)
+    before = file_signature(path)
+    history = load_history(path)
+    last_channel, last_videos = history.latest_state()
+
+    record = {"t": now}
+    if not history.records:
+        record["k"] = 1
+    if channel != last_channel:
+        record["c"] = channel
+    changed = {video_id: values for video_id, values in videos.items() if last_videos.get(video_id) != values}
+    if changed:
+        record["v"] = changed
+    if len(record) == 1 or (len(record) == 2 and "k" in record):
+        return False
+
+    written = _append_line(path, record)
+    history = history.appended(record)
+    after = file_signature(path)
+    with _history_lock:
+        # 그사이 다른 곳에서 덧붙이지 않았으면(이 줄만큼만 커졌으면) 다시 읽지 않도록 캐시를 바로 갱신
+        if after is not None and after[1] == (before[1] if before else 0) + written:
+            _history_cache[path] = (after, history)
+        else:
+            _history_cache.pop(path, None)
+    if needs_compaction(history.records, now):
+        compact_history(path, now=now)
+    return True
+
+
+def _cutoff_days(now):
+    """(보관 기간이 지난 날의 경계, 하루 하나로 줄일 날의 경계). 이 날짜 이전의 날이 정리 대상입니다."""
+    retention_day = (now - HISTORY_RETENTION_DAYS * DAY_SECONDS) // DAY_SECONDS
+    full_day = (now - HISTORY_FULL_DAYS * DAY_SECONDS) // DAY_SECONDS
+    return retention_day, full_day
+
+
+def needs_compaction(records, now):
+    """기준 기록 밖에 보관 기간이 지난 기록이 있거나, 하루 하나로 줄여야 할 날이 있으면 True.
+
+    정리 대상은 날짜 단위로 정해지므로 한 번 정리한 뒤에는 다음 날이 기간을 넘을 때까지 False입니다.
+    """
+    retention_day, full_day = _cutoff_days(now)
+    expired = 0
+    days = set()
+    for record in records:  # 시각 오름차순이므로 정리 대상이 아닌 날에 이르면 멈춤
+        day = record["t"] // DAY_SECONDS
+        if day >= full_day:
+            break
+        if day < retention_day:
+            expired += 1
+            if expired > 1:
+                return True
+        elif day in days:
+            return True
+        else:
+            days.add(day)
+    return False
+
+
+def compact_history(path=HISTORY_FILE, now=None):
+    """오래된 기록을 하루 하나로 줄이고, 보관 기간이 지난 기록은 기준 기록에 합쳐 파일을 원자적으로 다시 씁니다.
+
+    줄어든 기록 수를 반환합니다.
+    """
+    now = int(now or time.time())
+    retention_day, full_day = _cutoff_days(now)
+    records = _read_records(path)
+
+    # 1. 보관 기간이 지난 기록은 하나의 기준 기록으로 합침
+    base = {"t": None, "k": 1, "c": None, "v": {}}
+    kept = []
+    for record in records:
+        if record["t"] // DAY_SECONDS < retention_day:
+            base["t"] = record["t"]
+            if "c" in record:
+                base["c"] = record["c"]
+            base["v"].update(record.get("v", {}))
+        else:
+            kept.append(record)
+
+    # 2. 전체 보관 기간 밖의 기록은 날짜별로 합쳐 그날의 마지막 값만 남김
+    merged = []
+    for record in kept:
+        day = record["t"] // DAY_SECONDS
+        if merged and day < full_day and merged[-1]["t"] // DAY_SECONDS == day:
+            previous = merged.pop()
+            combined = {"t": record["t"]}
+            if previous.get("k"):
+                combined["k"] = 1
+            channel = record.get("c", previous.get("c"))
+            if channel is not None:
+                combined["c"] = channel
+            values = dict(previous.get("v", {}))
+            values.update(record.get("v", {}))
+            if values:
+                combined["v"] = values
+            record = combined
+        merged.append(record)
+
+    if base["t"] is not None:
+        merged.insert(0, {key: value for key, value in base.items() if value not in (None, {})})
+    elif merged:
+        merged[0]["k"] = 1
+
+    lines = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in merged)
+    write_bytes_atomic(path, lines.encode("utf-8"))
+    return len(records) - len(merged)
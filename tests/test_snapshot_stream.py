@@ -0,0 +1,157 @@
+"""snapshot_stream 파서와 snapshot_store 스트리밍 로드 테스트"""
+import io
+import json
+
+import pytest
+
+import snapshot_store
+from snapshot_stream import READ_CHUNK_SIZE, SnapshotRecordError, iter_snapshot_events
+
+SAMPLE = {
+    "schema_version": 2,
+    "channel_info": {"id": "UCabc", "snippet": {"title": "하늘빛 \"CCM\"\n\\"}, "ratio": -1.5e-7},
+    "videos": [
+        {"details": {"id": f"v{i}", "snippet": {"title": "찬양 " * i, "tags": ["é", "é"]},
+                     "statistics": {"viewCount": str(i * 1234567)}, "score": i * 12345.678e10, "ok": i % 2 == 0,
+                     "none": None}}
+        for i in range(30)
+    ],
+    "podcast_videos": [],
+    "big": 123456789012345678901234567890,
+    "last_updated": "2025-01-01T00:00:00Z",
+}
+
+
+class CountingReader(io.StringIO):
+    """읽은 문자 수를 세는 텍스트 스트림"""
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.chars_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.chars_read += len(chunk)
+        return chunk
+
+
+def parse(text, chunk_size=READ_CHUNK_SIZE):
+    """이벤트를 모아 딕셔너리로 되돌립니다."""
+    data = {}
+    for kind, key, value in iter_snapshot_events(io.StringIO(text), chunk_size=chunk_size):
+        if kind == "field":
+            data[key] = value
+        else:
+            data[key].append(value)
+    return data
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 16, 64])
+def test_values_split_across_chunk_boundaries(chunk_size, ensure_ascii):
+    # 숫자(지수·음수·큰 정수), 이스케이프, 유니코드, 리터럴이 청크 경계에서 잘려도 json.loads와 같은 결과
+    text = json.dumps(SAMPLE, ensure_ascii=ensure_ascii, indent=1)
+    assert parse(text, chunk_size) == SAMPLE
+
+
+@pytest.mark.parametrize("number", ["0", "-12", "1e5", "1.25E-10", "123456789012345678901234567890"])
+def test_number_at_end_of_every_chunk_size(number):
+    text = '{"videos": [%s, %s], "n": %s}' % (number, number, number)
+    for chunk_size in range(1, len(text) + 1):
+        assert parse(text, chunk_size) == json.loads(text)
+
+
+def test_records_are_emitted_one_at_a_time():
+    events = list(iter_snapshot_events(io.StringIO(json.dumps(SAMPLE))))
+    assert events[0] == ("field", "schema_version", 2)
+    assert ("field", "videos", []) in events
+    records = [value for kind, key, value in events if kind == "record"]
+    assert records == SAMPLE["videos"]
+
+
+@pytest.mark.parametrize("chunk_size", [4, READ_CHUNK_SIZE])
+def test_truncation_at_every_structural_position_raises(chunk_size):
+    # 잘린 레코드는 SnapshotRecordError, 그 밖의 위치는 JSONDecodeError (둘 다 ValueError)
+    text = json.dumps({"schema_version": 2, "channel_info": {"a": [1, True, None]},
+                       "videos": [{"details": {"id": "v1"}}, {"details": {"id": "v2"}}], "n": 1.5})
+    structural = {i for i, char in enumerate(text) if char in '{}[]:,"'}
+    for cut in sorted(structural | {i + 1 for i in structural} | set(range(0, len(text), 3))):
+        if cut >= len(text):
+            continue
+        with pytest.raises(ValueError):
+            parse(text[:cut], chunk_size)
+
+
+def test_truncated_record_reports_its_index():
+    text = json.dumps({"videos": [{"details": {"id": "v1"}}, {"details": {"id": "v2"}}]})
+    with pytest.raises(SnapshotRecordError) as info:
+        parse(text[:text.index('"v2"') + 2])
+    assert (info.value.key, info.value.index) == ("videos", 1)
+
+
+def test_malformed_record_mid_file_fails_without_reading_the_rest():
+    videos = [{"details": {"id": f"v{i}", "description": "x" * 1000}} for i in range(5000)]
+    text = json.dumps({"schema_version": 2, "videos": videos})
+    broken = text.replace('"id": "v5"', '"id": "v5" oops', 1)
+    f = CountingReader(broken)
+    with pytest.raises(SnapshotRecordError) as info:
+        for _ in iter_snapshot_events(f):
+            pass
+    assert (info.value.key, info.value.index) == ("videos", 5)
+    assert f.chars_read <= 2 * READ_CHUNK_SIZE < len(broken)
+
+
+@pytest.mark.parametrize("text", ['[]', '{"a": 1} {}', '{"a": 1,}', '{1: 2}', '{"videos": [1 2]}'])
+def test_invalid_documents(text):
+    with pytest.raises(json.JSONDecodeError):
+        parse(text)
+
+
+def test_empty_object():
+    assert parse("{}") == {}
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path / "channel_data.json")
+
+
+def _video(video_id, views):
+    return {"details": {"id": video_id, "snippet": {"title": video_id}, "statistics": {"viewCount": views}}}
+
+
+@pytest.mark.parametrize("suffix", ["", ".gz"])
+def test_load_snapshot_round_trip(snapshot_path, suffix):
+    path = snapshot_path + suffix
+    data = {"channel_info": {"id": "UCabc", "snippet": {"title": "t"}}, "videos": [_video("a", "1")], "podcast_videos": []}
+    generation = snapshot_store.save_snapshot(path, data)
+    loaded = snapshot_store.load_snapshot(path)
+    assert loaded["generation"] == generation
+    assert [v["details"]["id"] for v in loaded["videos"]] == ["a"]
+    assert loaded["videos"][0]["search_snippet"]["title"] == "a"
+
+
+def test_corrupt_snapshot_falls_back_to_previous_generation(snapshot_path):
+    first = {"channel_info": {}, "videos": [_video("a", "1")]}
+    snapshot_store.save_snapshot(snapshot_path, first)
+    second = {"channel_info": {}, "videos": [_video("a", "2"), _video("b", "1")]}
+    snapshot_store.save_snapshot(snapshot_path, second, previous=first)
+
+    with open(snapshot_path, "r+", encoding="utf-8") as f:
+        text = f.read()
+        f.seek(0)
+        f.truncate()
+        f.write(text[:len(text) // 2])
+
+    loaded = snapshot_store.load_snapshot(snapshot_path)
+    assert loaded["generation"] == 1
+    assert [v["details"]["statistics"]["viewCount"] for v in loaded["videos"]] == ["1"]
+
+
+def test_all_generations_corrupt_raises(snapshot_path):
+    snapshot_store.save_snapshot(snapshot_path, {"channel_info": {}, "videos": [_video("a", "1")]})
+    with open(snapshot_path, "w", encoding="utf-8") as f:
+        f.write('{"videos": [{"details": ')
+    with pytest.raises(ValueError):
+        snapshot_store.load_snapshot(snapshot_path)
@@ -0,0 +1,78 @@
+"""stats_history 기록·구간 조회 테스트"""
+import pytest
+
+import stats_history
+from stats_history import DAY_SECONDS, History, load_history, record_snapshot_stats
+
+
+def _snapshot(subscribers, views):
+    return {
+        "channel_info": {"statistics": {"subscriberCount": str(subscribers), "videoCount": str(len(views)), "viewCount": "0"}},
+        "videos": [{"details": {"id": video_id, "statistics": {"viewCount": str(count)}}} for video_id, count in views.items()],
+    }
+
+
+@pytest.fixture
+def history_path(tmp_path):
+    return str(tmp_path / "stats_history.jsonl")
+
+
+def test_records_only_changes_and_reuses_cache_without_reparsing(history_path, monkeypatch):
+    now = 1_700_000_000
+    assert record_snapshot_stats(_snapshot(10, {"a": 1, "b": 5}), history_path, now=now)
+    assert not record_snapshot_stats(_snapshot(10, {"a": 1, "b": 5}), history_path, now=now + 60)
+
+    reads = []
+    original = stats_history._read_records
+    monkeypatch.setattr(stats_history, "_read_records", lambda path: reads.append(path) or original(path))
+    assert record_snapshot_stats(_snapshot(11, {"a": 3, "b": 5}), history_path, now=now + 120)
+    history = load_history(history_path)
+    assert reads == []
+    assert history.records[-1] == {"t": now + 120, "c": [11, 2, 0], "v": {"a": [3, 0, 0]}}
+
+    # 캐시에 합친 이력과 파일을 새로 읽은 이력이 같음
+    reread = History(original(history_path))
+    assert reread.channel == history.channel and reread.videos == history.videos
+    assert reread.video_times == history.video_times
+
+
+def test_range_and_trending_queries():
+    records = [
+        {"t": 0, "k": 1, "c": [1, 2, 3], "v": {"a": [10, 0, 0], "b": [10, 0, 0]}},
+        {"t": 5 * DAY_SECONDS, "v": {"a": [15, 0, 0]}},
+        {"t": 9 * DAY_SECONDS, "c": [2, 2, 3], "v": {"a": [40, 0, 0], "b": [12, 0, 0]}},
+    ]
+    history = History(records)
+    assert history.channel_series(DAY_SECONDS, 10 * DAY_SECONDS) == [(DAY_SECONDS, [1, 2, 3]), (9 * DAY_SECONDS, [2, 2, 3])]
+    assert history.video_series("a", 6 * DAY_SECONDS) == [(6 * DAY_SECONDS, [15, 0, 0]), (9 * DAY_SECONDS, [40, 0, 0])]
+    assert history.trending(days=7, now=10 * DAY_SECONDS) == [("a", 30), ("b", 2)]
+
+
+def test_compaction_keeps_latest_state(history_path):
+    now = 400 * DAY_SECONDS
+    record_snapshot_stats(_snapshot(1, {"a": 1}), history_path, now=now - 380 * DAY_SECONDS)
+    record_snapshot_stats(_snapshot(2, {"a": 2}), history_path, now=now - 30 * DAY_SECONDS)
+    record_snapshot_stats(_snapshot(3, {"a": 3}), history_path, now=now - 30 * DAY_SECONDS + 60)
+    record_snapshot_stats(_snapshot(4, {"a": 4}), history_path, now=now)
+
+    history = load_history(history_path)
+    assert history.latest_state() == ([4, 1, 0], {"a": [4, 0, 0]})
+    assert len(history.records) == 3
+    assert history.records[0].get("k") == 1
+
+
+def test_hourly_syncs_compact_about_once_a_day(history_path, monkeypatch):
+    compactions = []
+    original = stats_history.compact_history
+    monkeypatch.setattr(stats_history, "compact_history",
+                        lambda path, now=None: compactions.append(now) or original(path, now=now))
+    start = 1_700_000_000 - 1_700_000_000 % DAY_SECONDS
+    days = stats_history.HISTORY_FULL_DAYS + 10
+    for hour in range(days * 24):
+        record_snapshot_stats(_snapshot(hour, {"a": hour, "b": hour // 2}), history_path, now=start + hour * 3600)
+
+    # 기간을 넘은 날마다 한 번씩만 정리
+    assert len(compactions) == days - stats_history.HISTORY_FULL_DAYS - 1
+    history = load_history(history_path)
+    assert history.latest_state() == ([days * 24 - 1, 2, 0], {"a": [days * 24 - 1, 0, 0], "b": [(days * 24 - 1) // 2, 0, 0]})
+    assert not stats_history.needs_compaction(history.records, start + (days * 24 - 1) * 3600)
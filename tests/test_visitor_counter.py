@@ -0,0 +1,102 @@
+"""visitor_counter 버퍼링·반영·표시 값 테스트"""
+import pytest
+
+from visitor_counter import BufferedCounter, MemoryCounterBackend, SqliteCounterBackend
+
+
+class FlakyBackend(MemoryCounterBackend):
+    """지정한 횟수만큼 increment·total이 실패하고, 호출 횟수를 세는 저장소"""
+
+    def __init__(self, increment_failures=0, total_failures=0):
+        super().__init__()
+        self.increment_failures = increment_failures
+        self.total_failures = total_failures
+        self.total_calls = 0
+
+    def increment(self, shard, amount):
+        if self.increment_failures:
+            self.increment_failures -= 1
+            raise ConnectionError("unavailable")
+        super().increment(shard, amount)
+
+    def total(self):
+        self.total_calls += 1
+        if self.total_failures:
+            self.total_failures -= 1
+            raise ConnectionError("unavailable")
+        return super().total()
+
+
+def test_count_is_none_until_the_first_flush_reads_the_total():
+    backend = MemoryCounterBackend()
+    backend.increment(0, 100)
+    counter = BufferedCounter(backend)
+    assert counter.increment() is None
+    assert counter.flush() == 1
+    assert counter.count() == 101
+    assert backend.total() == 101
+
+
+def test_count_adds_pending_to_cached_total_without_backend_calls():
+    backend = FlakyBackend()
+    counter = BufferedCounter(backend, shards=3)
+    counter.flush()
+    calls = backend.total_calls
+
+    assert [counter.increment() for _ in range(3)] == [1, 2, 3]
+    backend.increment(0, 10)  # 다른 프로세스의 증가분은 합계를 다시 읽을 때 반영
+    assert counter.count() == 3
+    assert backend.total_calls == calls
+
+    # 캐시가 아직 유효하면 반영한 증가분만 더함
+    assert counter.flush() == 3
+    assert counter.count() == 3
+    assert backend.total_calls == calls
+    assert sum(backend.counts.values()) == 13
+
+
+def test_flush_rereads_total_after_ttl():
+    backend = FlakyBackend()
+    counter = BufferedCounter(backend, cache_ttl=0)
+    counter.flush()
+    counter.increment(2)
+    backend.increment(1, 10)
+    assert counter.flush() == 2
+    assert counter.count() == 12
+
+
+def test_failed_flush_keeps_pending_for_retry():
+    backend = FlakyBackend(increment_failures=1)
+    counter = BufferedCounter(backend)
+    counter.flush()
+    counter.increment(5)
+
+    assert counter.flush() == 0
+    assert counter.count() == 5
+    assert backend.counts == {}
+
+    assert counter.flush() == 5
+    assert counter.count() == 5
+    assert backend.total() == 5
+
+
+def test_failed_total_read_keeps_last_value():
+    backend = FlakyBackend()
+    counter = BufferedCounter(backend, cache_ttl=0)
+    counter.flush()
+    counter.increment(4)
+    backend.total_failures = 1
+    assert counter.flush() == 4
+    assert counter.count() == 4
+
+
+@pytest.mark.parametrize("shards", [1, 4])
+def test_sqlite_backend_sums_shards(tmp_path, shards):
+    backend = SqliteCounterBackend(str(tmp_path / "counter.sqlite3"))
+    counter = BufferedCounter(backend, shards=shards)
+    for amount in (1, 2, 3):
+        counter.increment(amount)
+        counter.flush()
+    assert backend.total() == 6
+    assert counter.count() == 6
+    assert SqliteCounterBackend(str(tmp_path / "counter.sqlite3"), name="other").total() == 0
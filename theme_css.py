@@ -0,0 +1,131 @@
+"""
+페이지 테마(다크/라이트) CSS 모듈
+
+두 테마의 스타일시트는 프로세스당 한 번만 만들고(공백·주석을 줄인 최소화 버전) 모든 세션이 함께 씁니다.
+THEME_CSS_STATIC을 켜면 스타일시트를 Streamlit 정적 파일(static/)로 한 번 써 두고,
+페이지에는 내용 해시가 붙은 <link> 태그만 넣어 브라우저가 캐시하게 합니다.
+(.streamlit/config.toml의 [server] enableStaticServing = true 필요)
+"""
+import functools
+import hashlib
+import os
+import re
+
+# 스타일시트를 정적 파일로 제공할지 여부 (False면 <style> 태그로 직접 삽입)
+THEME_CSS_STATIC = os.environ.get("THEME_CSS_STATIC", "").lower() in ("1", "true", "yes")
+STATIC_DIR = "static"
+STATIC_URL = "app/static"
+
+# 공통 스타일
+BASE_CSS = """
+    [data-testid="stHorizontalBlock"] {
+        overflow: visible !important;
+    }
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] {
+        position: -webkit-sticky;
+        position: sticky;
+        top: 2rem;
+        z-index: 100;
+        padding: 1.5rem;
+        border-radius: 15px;
+    }
+    .block-container { max-width: 1024px !important; padding: 2rem 1rem 10rem 1rem !important; }
+    .main-header { font-size: 3rem; font-weight: bold; text-align: center; margin-bottom: 1rem; text-shadow: 2px 2px 4px rgba(0,0,0,0.2); }
+    .sub-header { font-size: 1.3rem; text-align: center; margin-bottom: 2.5rem; font-style: italic; }
+    .stats-container { display: flex; justify-content: center; gap: 3.5rem; margin: 1.5rem 0; padding: 1.2rem; border-radius: 10px; }
+    .stat-item { text-align: center; }
+    .stat-number { font-size: 2rem; font-weight: bold; }
+    .stat-label { font-size: 0.9rem; opacity: 0.9; }
+    .video-card { border-radius: 15px; padding: 1.5rem; margin-bottom: 1.2rem; box-shadow: 0 8px 32px rgba(0,0,0,0.15); transition: all 0.3s ease; }
+    .video-card:hover { transform: translateY(-5px); box-shadow: 0 12px 40px rgba(0,0,0,0.2); }
+    .video-card-content { display: flex; align-items: flex-start; gap: 1rem; }
+    .video-thumbnail { width: 180px; border-radius: 8px; }
+    .video-info h3 { margin: 0 0 0.5rem 0; font-size: 1.3rem; font-weight: bold; }
+    .video-info p { margin: 0.5rem 0; font-size: 0.9rem; }
+    .video-info .video-meta { font-size: 0.8rem; margin-top: 0.5rem; }
+    .shortcut-buttons { text-align: right; }
+    .shortcut-button { display: inline-block; padding: 0.4rem 1rem; border-radius: 8px; text-decoration: none !important; font-weight: bold; margin-left: 0.5rem; transition: all 0.3s ease; }
+"""
+
+# 라이트 모드 스타일
+LIGHT_CSS = """
+    .stApp { background: #f0f2f6; color: #333; }
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] {
+        background-color: #ffffff;
+    }
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] h1, 
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] h2, 
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] h3, 
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] strong,
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] div,
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] li { color: #333 !important; }
+    .video-card { background: #ffffff; }
+    .video-info h3 a { color: #1f77b4 !important; }
+    .video-info p, .video-info .video-meta { color: #444 !important; }
+    .shortcut-button { background: #e2e8f0; color: #1e293b !important; }
+    .shortcut-button:hover { background: #cbd5e1; }
+"""
+
+# 다크 모드 스타일
+DARK_CSS = """
+    .stApp { background: #0f172a; color: #e2e8f0; }
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] {
+        background-color: #1e293b;
+    }
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] h1, 
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] h2, 
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] h3, 
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] strong,
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] div,
+    [data-testid="stHorizontalBlock"] > div:nth-child(1) > [data-testid="stVerticalBlock"] li { color: #f8fafc !important; }
+    .video-card { background: #1e293b; border: 1px solid #334155; }
+    .video-info h3 a { color: #f8fafc !important; }
+    .video-info p, .video-info .video-meta { color: #cbd5e1 !important; }
+    .shortcut-button { background: #334155; color: #f1f5f9 !important; }
+    .shortcut-button:hover { background: #475569; }
+"""
+
+
+def minify_css(css):
+    """주석과 불필요한 공백을 제거합니다. (선택자 안의 자손 결합자 공백은 하나로 유지)"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)  # 선언의 '속성: 값' 공백 (선택자에는 ':' 뒤 공백이 없음)
+    return css.replace(";}", "}").strip()
+
+
+@functools.lru_cache(maxsize=None)
+def get_stylesheet(dark_mode):
+    """테마의 최소화된 스타일시트를 반환합니다. (프로세스당 테마별 한 번만 생성)"""
+    return minify_css((DARK_CSS if dark_mode else LIGHT_CSS) + BASE_CSS)
+
+
+@functools.lru_cache(maxsize=None)
+def get_static_stylesheet_url(dark_mode):
+    """스타일시트를 static/ 아래에 한 번 쓰고, 내용 해시를 붙인 URL을 반환합니다."""
+    css = get_stylesheet(dark_mode)
+    name = f"theme-{'dark' if dark_mode else 'light'}.css"
+    path = os.path.join(STATIC_DIR, name)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            current = f.read()
+    except OSError:
+        current = None
+    if current != css:
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(css)
+    version = hashlib.sha1(css.encode("utf-8")).hexdigest()[:10]
+    return f"{STATIC_URL}/{name}?v={version}"
+
+
+@functools.lru_cache(maxsize=None)
+def get_theme_markup(dark_mode):
+    """페이지에 삽입할 테마 HTML(<style> 또는 <link>)을 반환합니다."""
+    if THEME_CSS_STATIC:
+        try:
+            return f'<link rel="stylesheet" href="{get_static_stylesheet_url(dark_mode)}">'
+        except OSError as e:
+            print(f"테마 CSS 정적 파일을 쓸 수 없어 직접 삽입합니다: {e}")
+    return f"<style>{get_stylesheet(dark_mode)}</style>"
@@ -0,0 +1,280 @@
+"""
+동영상 썸네일 로컬 캐시 모듈
+
+동기화할 때 스냅샷의 썸네일(i.ytimg.com)을 내려받아 크기별(THUMBNAIL_SIZES)로 줄인
+WebP/JPEG 파일을 만들고, 내용 해시(sha256)를 파일명으로 하는 디스크 캐시(static/thumbnails)에 보관합니다.
+원본 URL → 변형 파일 목록은 thumbnail_index.json에 기록합니다.
+
+페이지는 카드를 그릴 때 thumbnail_src()로 이미지 주소를 정합니다.
+- "static"(기본값): Streamlit 정적 파일(app/static/thumbnails/...)로 제공 (.streamlit/config.toml의 enableStaticServing)
+- "data": 작은 변형을 data URI로 카드에 직접 넣음 (정적 파일을 제공할 수 없는 배포용, 프로세스 메모리에 캐시)
+캐시에 없는 썸네일은 원래 주소를 그대로 사용합니다.
+
+캐시 전체 크기가 THUMBNAIL_CACHE_MAX_BYTES를 넘으면 가장 오래 쓰이지 않은(수정 시각이 오래된) 파일부터 지웁니다.
+동기화 때마다 현재 스냅샷의 썸네일 파일은 수정 시각을 갱신하므로, 채널에서 사라진 동영상의 썸네일이 먼저 지워집니다.
+"""
+import functools
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from lazy_imports import LazyModule
+from snapshot_store import file_signature, load_json_cached, write_json_atomic
+
+requests = LazyModule("requests")
+
+THUMBNAIL_DIR = os.path.join("static", "thumbnails")
+THUMBNAIL_URL = "app/static/thumbnails"
+# 배너 등 로컬 이미지를 줄여 두는 정적 파일 위치
+LOCAL_IMAGE_DIR = os.path.join("static", "images")
+LOCAL_IMAGE_URL = "app/static/images"
+THUMBNAIL_INDEX_FILE = "thumbnail_index.json"
+
+# 변형 이름 → 최대 가로 크기(px). card는 카드 표시용(180px의 고해상도 화면 대응), small은 data URI용
+THUMBNAIL_SIZES = {"card": 320, "small": 180}
+# 변형 형식 → (Pillow 형식 이름, 저장 옵션)
+THUMBNAIL_FORMATS = {
+    "webp": ("WEBP", {"quality": 75, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 80, "optimize": True, "progressive": True}),
+}
+# 페이지에서 사용할 형식 우선순위
+THUMBNAIL_PREFERRED_FORMATS = ("webp", "jpeg")
+
+THUMBNAIL_CACHE_MAX_BYTES = 50 * 1024 * 1024
+THUMBNAIL_DOWNLOAD_WORKERS = 4
+THUMBNAIL_TIMEOUT = (5, 15)
+
+# 썸네일 제공 방식: "static" / "data" / "remote"(캐시를 쓰지 않음)
+THUMBNAIL_SERVE = os.environ.get("THUMBNAIL_SERVE", "static")
+# 이 크기 이하의 변형만 data URI로 넣음 (그보다 크면 원래 주소 사용)
+DATA_URI_MAX_BYTES = 16 * 1024
+
+_MIME_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg"}
+
+
+def snapshot_thumbnail_urls(data):
+    """스냅샷의 채널 동영상·팟캐스트 썸네일(medium) 주소 목록을 반환합니다. (중복 제거, 순서 유지)"""
+    snippets = [v.get('search_snippet', {}) for v in data.get("videos", [])]
+    snippets += [item.get('snippet', {}) for item in data.get("podcast_videos", [])]
+    urls = (s.get('thumbnails', {}).get('medium', {}).get('url') for s in snippets)
+    return list(dict.fromkeys(url for url in urls if url))
+
+
+def load_thumbnail_index():
+    """원본 URL → {변형 이름: {형식: 상대 경로}} 색인을 반환합니다. (공유 객체이므로 수정하지 말 것)"""
+    index = load_json_cached(THUMBNAIL_INDEX_FILE, {})
+    return index if isinstance(index, dict) else {}
+
+
+def thumbnail_cache_version():
+    """색인 파일 서명. 썸네일 캐시가 바뀌면 달라지므로 카드 HTML 캐시 키에 함께 사용합니다."""
+    return file_signature(THUMBNAIL_INDEX_FILE)
+
+
+def _encode_variants(content):
+    """원본 이미지 바이트로 크기·형식별 변형 {변형 이름: {형식: 바이트}}을 만듭니다."""
+    import io
+    from PIL import Image
+
+    with Image.open(io.BytesIO(content)) as image:
+        image = image.convert("RGB")
+        variants = {}
+        for size_name, max_width in THUMBNAIL_SIZES.items():
+            resized = image.copy()
+            # 가로 기준으로만 줄이고, 원본보다 키우지 않음
+            resized.thumbnail((max_width, max_width * 4), Image.LANCZOS)
+            variants[size_name] = {}
+            for fmt, (pil_format, options) in THUMBNAIL_FORMATS.items():
+                buffer = io.BytesIO()
+                try:
+                    resized.save(buffer, pil_format, **options)
+                except (KeyError, OSError):
+                    continue  # WebP 인코더가 없는 Pillow 빌드 등
+                variants[size_name][fmt] = buffer.getvalue()
+    return variants
+
+
+def _store_blob(blob, fmt):
+    """내용 해시를 이름으로 파일을 저장하고 상대 경로를 반환합니다. 같은 내용이면 다시 쓰지 않습니다."""
+    digest = hashlib.sha256(blob).hexdigest()
+    relative = f"{digest[:2]}/{digest}.{fmt}"
+    path = os.path.join(THUMBNAIL_DIR, relative)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, path)
+    return relative
+
+
+def _download_thumbnail(url, session):
+    """썸네일 하나를 내려받아 변형을 저장하고 색인 항목을 반환합니다. 실패하면 None."""
+    try:
+        response = (session or requests).get(url, timeout=THUMBNAIL_TIMEOUT)
+        response.raise_for_status()
+        variants = _encode_variants(response.content)
+    except Exception as e:
+        print(f"썸네일을 캐시하지 못했습니다({url}): {e}")
+        return None
+    return {size_name: {fmt: _store_blob(blob, fmt) for fmt, blob in formats.items()}
+            for size_name, formats in variants.items()}
+
+
+def _entry_paths(entry):
+    return [os.path.join(THUMBNAIL_DIR, relative) for formats in entry.values() for relative in formats.values()]
+
+
+def _entry_complete(entry):
+    return bool(entry) and all(os.path.exists(path) for path in _entry_paths(entry))
+
+
+def evict_thumbnails(max_bytes=THUMBNAIL_CACHE_MAX_BYTES):
+    """캐시 크기가 max_bytes 이하가 될 때까지 수정 시각이 오래된 파일부터 지우고, 지운 파일 수를 반환합니다."""
+    files = []
+    for root, _, names in os.walk(THUMBNAIL_DIR):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    removed = 0
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def sync_thumbnails(data, session=None):
+    """스냅샷의 썸네일을 캐시에 채우고, 오래된 파일을 정리한 뒤 색인을 저장합니다.
+
+    이미 캐시된 썸네일은 내려받지 않고 사용 시각(수정 시각)만 갱신합니다. 내려받은 수를 반환합니다.
+    Pillow가 설치되어 있지 않으면 아무것도 하지 않습니다.
+    """
+    if THUMBNAIL_SERVE == "remote":
+        return 0
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return 0
+
+    urls = snapshot_thumbnail_urls(data)
+    index = dict(load_thumbnail_index())
+    missing = [url for url in urls if not _entry_complete(index.get(url))]
+    now = time.time()
+    for url in urls:
+        if url not in missing:
+            for path in _entry_paths(index[url]):
+                os.utime(path, (now, now))
+
+    with ThreadPoolExecutor(max_workers=THUMBNAIL_DOWNLOAD_WORKERS) as executor:
+        entries = list(executor.map(lambda url: _download_thumbnail(url, session), missing))
+    downloaded = 0
+    for url, entry in zip(missing, entries):
+        if entry:
+            index[url] = entry
+            downloaded += 1
+
+    evict_thumbnails()
+    # 파일이 지워진 항목과 현재 스냅샷에 없는 항목은 색인에서 제외
+    current = set(urls)
+    index = {url: entry for url, entry in index.items() if url in current and _entry_complete(entry)}
+    if index != load_thumbnail_index():
+        write_json_atomic(THUMBNAIL_INDEX_FILE, index)
+    return downloaded
+
+
+@functools.lru_cache(maxsize=2048)
+def _data_uri(relative, fmt):
+    """캐시 파일을 data URI로 읽습니다. 파일 이름이 내용 해시이므로 결과를 계속 재사용할 수 있습니다."""
+    import base64
+
+    with open(os.path.join(THUMBNAIL_DIR, relative), "rb") as f:
+        blob = f.read()
+    if len(blob) > DATA_URI_MAX_BYTES:
+        return None
+    return f"data:{_MIME_TYPES[fmt]};base64,{base64.b64encode(blob).decode('ascii')}"
+
+
+def _pick_format(formats):
+    for fmt in THUMBNAIL_PREFERRED_FORMATS:
+        if fmt in formats:
+            return fmt
+    return None
+
+
+def thumbnail_src(url):
+    """카드 <img>에 넣을 썸네일 주소를 반환합니다. 캐시에 없으면 원래 주소를 반환합니다."""
+    if not url or THUMBNAIL_SERVE == "remote":
+        return url
+    entry = load_thumbnail_index().get(url)
+    if not entry:
+        return url
+    try:
+        if THUMBNAIL_SERVE == "static":
+            formats = entry.get("card", {})
+            fmt = _pick_format(formats)
+            return f"{THUMBNAIL_URL}/{formats[fmt]}" if fmt else url
+        formats = entry.get("small", {})
+        fmt = _pick_format(formats)
+        return (_data_uri(formats[fmt], fmt) if fmt else None) or url
+    except OSError:
+        return url
+
+
+def _encode_local_image(path, max_width):
+    """로컬 이미지를 가로 max_width 이하의 JPEG 바이트로 줄입니다."""
+    import io
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image = image.convert("RGB")
+        image.thumbnail((max_width, max_width * 4), Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=75, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+@functools.lru_cache(maxsize=16)
+def _image_file_src(path, signature, max_width, serve):
+    import base64
+
+    blob = _encode_local_image(path, max_width)
+    if serve == "data":
+        return f"data:image/jpeg;base64,{base64.b64encode(blob).decode('ascii')}"
+    # 썸네일 캐시와 달리 정리 대상이 아닌 디렉터리에 내용 해시 이름으로 저장
+    name = f"{hashlib.sha256(blob).hexdigest()[:16]}.jpg"
+    target = os.path.join(LOCAL_IMAGE_DIR, name)
+    if not os.path.exists(target):
+        os.makedirs(LOCAL_IMAGE_DIR, exist_ok=True)
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, target)
+    return f"{LOCAL_IMAGE_URL}/{name}"
+
+
+def local_image_src(path, max_width=960):
+    """로컬 이미지 파일(배너 등)을 줄인 JPEG의 주소를 반환합니다. 파일이 바뀔 때만 다시 만듭니다.
+
+    THUMBNAIL_SERVE가 "data"면 data URI로, 그 밖에는 정적 파일(app/static/images/...)로 제공합니다.
+    파일이 없거나 Pillow를 쓸 수 없으면 경로를 그대로 반환합니다.
+    """
+    signature = file_signature(path)
+    if signature is None:
+        return path
+    try:
+        return _image_file_src(path, signature, max_width, THUMBNAIL_SERVE)
+    except Exception as e:
+        print(f"이미지를 변환하지 못했습니다({path}): {e}")
+        return path
@@ -0,0 +1,84 @@
+"""
+동영상 카드 HTML 렌더링 모듈
+
+카드 HTML은 스냅샷 데이터(VideoView)만으로 정해지므로, (동영상 ID, 카드 버전)마다
+한 번만 만들어 프로세스 전체(모든 세션)에서 재사용합니다. 카드 버전은 스냅샷 경로·generation과 썸네일 캐시 서명이고,
+여러 채널을 함께 보여 줄 때를 위해 최근 버전 FRAGMENT_CACHE_VERSIONS개의 조각을 보관합니다. 카드 앞의 순번만 정렬·검색에 따라
+달라지므로 조각을 순번 앞/뒤 두 부분으로 보관해 두고, 섹션을 그릴 때 순번을 끼워 이어 붙입니다.
+섹션 전체를 하나의 문자열로 만들어 st.markdown 한 번으로 보내므로 재실행마다 보내는
+Streamlit 메시지 수도 카드 수와 관계없이 섹션당 하나입니다.
+"""
+import threading
+from collections import OrderedDict
+
+from thumbnail_cache import thumbnail_src
+
+# 카드에 표시할 설명 글자 수
+CARD_DESCRIPTION_CHARS = 150
+
+# 분류별 제목 뒤 표시 아이콘
+CATEGORY_MARKERS = {"podcast": " 🎧", "short": " 📱", "normal": ""}
+
+# 보관할 카드 버전 수 (채널별 스냅샷마다 하나, 가장 오래 쓰지 않은 버전부터 버림)
+FRAGMENT_CACHE_VERSIONS = 8
+
+# 카드 버전 → {(동영상 ID, 분류): (순번 앞 HTML, 순번 뒤 HTML)}
+_fragment_caches = OrderedDict()
+_fragment_cache_lock = threading.Lock()
+
+
+def build_card_fragment(video):
+    """카드 HTML을 순번 앞/뒤 두 부분으로 만들어 반환합니다."""
+    if video.category == "podcast":
+        # 팟캐스트는 상세 정보가 없으므로 업로드 날짜만 표시
+        meta = f"업로드: {video.published_label}"
+    else:
+        meta = (f"조회수: {video.view_count:,} | 좋아요: {video.like_count:,} | "
+                f"길이: {video.duration_label} | 업로드: {video.published_label}")
+    head = (
+        '<div class="video-card">\n'
+        '<div class="video-card-content">\n'
+        f'<img src="{thumbnail_src(video.thumbnail_url)}" class="video-thumbnail">\n'
+        '<div class="video-info">\n'
+        f'<h3><a href="{video.url}" target="_blank">'
+    )
+    tail = (
+        f'. {video.title}{CATEGORY_MARKERS.get(video.category, "")}</a></h3>\n'
+        f'<p>{video.description[:CARD_DESCRIPTION_CHARS]}...</p>\n'
+        f'<div class="video-meta">\n{meta}\n</div>\n'
+        '</div>\n'
+        '</div>\n'
+        '</div>'
+    )
+    return head, tail
+
+
+def get_card_fragment(video, version):
+    """캐시된 카드 조각을 반환합니다. 최근 FRAGMENT_CACHE_VERSIONS개가 아닌 버전의 조각은 버립니다."""
+    key = (video.video_id, video.category)
+    with _fragment_cache_lock:
+        fragments = _fragment_caches.get(version)
+        if fragments is None:
+            fragments = _fragment_caches[version] = {}
+            while len(_fragment_caches) > FRAGMENT_CACHE_VERSIONS:
+                _fragment_caches.popitem(last=False)
+        else:
+            _fragment_caches.move_to_end(version)
+        fragment = fragments.get(key)
+    if fragment is None:
+        fragment = build_card_fragment(video)
+        with _fragment_cache_lock:
+            fragments[key] = fragment
+    return fragment
+
+
+def render_cards(videos, version, start=1):
+    """동영상 목록을 순번(start부터)을 붙인 카드 HTML 하나로 이어 붙여 반환합니다.
+
+    version은 카드 조각 캐시의 키입니다. (스냅샷 경로, generation, 썸네일 캐시 서명)
+    """
+    parts = []
+    for idx, video in enumerate(videos, start):
+        head, tail = get_card_fragment(video, version)
+        parts.append(f"{head}{idx}{tail}")
+    return "\n".join(parts)
@@ -0,0 +1,396 @@
+"""
+채널 스냅샷에서 화면 표시용 동영상 목록(카탈로그)을 만드는 모듈
+
+스냅샷마다 한 번만 재생 시간 파싱, 조회수·좋아요 수의 정수 변환, Shorts/일반/팟캐스트 분류를
+수행하여 화면에 쓰는 필드만 담은 VideoView(__slots__ 레코드) 목록으로 보관합니다.
+Streamlit 재실행에서는 이미 계산된 카탈로그를 그대로 사용하므로, 재실행마다 하는 일은
+화면에 표시하는 만큼으로 줄어듭니다.
+
+검색은 제목·설명·태그의 문자 n-gram(1·2글자) 역색인(SearchIndex)으로 처리합니다.
+띄어쓰기로 단어를 나누기 어려운 한글에서도 부분 문자열과 접두어 검색이 되고,
+검색 시간은 카탈로그 크기가 아니라 후보 수에 비례합니다.
+"""
+import re
+import sys
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+
+# 이 길이(초) 이하의 동영상은 Shorts로 분류
+SHORTS_MAX_SECONDS = 70
+# YouTube contentDetails.duration 형식 (예: PT1H2M3S, P1DT2H)
+_DURATION_PATTERN = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+# 검색 점수: 필드별 가중치와 접두어(단어 시작) 일치 보너스
+SEARCH_FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "description": 1.0}
+SEARCH_PREFIX_BONUS = 1.5
+
+# 정렬 방식: 이름 → (정렬 키 함수, 내림차순 여부). 스냅샷마다 한 번 정렬해 인덱스 배열로 보관
+SORT_ORDERS = {
+    "최신순": (lambda v: v.published_at, True),
+    "인기순": (lambda v: v.view_count, True),
+    "제목순": (lambda v: v.title, False),
+    "좋아요순": (lambda v: v.like_count, True),
+    "길이순": (lambda v: v.duration_seconds, True),
+}
+# 검색 결과의 관련도 정렬 이름 (검색어가 없으면 스냅샷 순서)
+RELEVANCE_ORDER = "관련도순"
+
+# 스냅샷 경로별로 가장 최근에 만든 카탈로그 (videos/podcast_videos 리스트 객체가 같으면 재사용)
+# 여러 채널(?channel=)을 함께 보여 줄 때 서로의 카탈로그를 버리지 않도록 최근 경로 CATALOG_CACHE_SIZE개를 보관 (LRU)
+CATALOG_CACHE_SIZE = 8
+_catalog_cache = OrderedDict()
+_catalog_cache_lock = threading.Lock()
+
+
+def format_date(date_string):
+    """날짜 포맷팅"""
+    try:
+        date_obj = datetime.strptime(date_string, '%Y-%m-%dT%H:%M:%SZ')
+        return date_obj.strftime('%Y년 %m월 %d일')
+    except:
+        return date_string
+
+
+def parse_duration_seconds(duration_str):
+    """ISO 8601 duration을 초 단위 정수로 변환합니다. 형식이 잘못되었으면 0을 반환합니다.
+
+    YouTube가 쓰는 P[n]DT[n]H[n]M[n]S 형식은 정규식으로 바로 처리하고,
+    그 밖의 형식(주·월·소수 등)만 isodate를 불러와 처리합니다.
+    """
+    match = _DURATION_PATTERN.match(duration_str or "")
+    if match:
+        days, hours, minutes, seconds = (int(value or 0) for value in match.groups())
+        return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+    try:
+        import isodate
+
+        return int(isodate.parse_duration(duration_str).total_seconds())
+    except:
+        return 0
+
+
+def format_seconds(total_seconds):
+    """초를 '분:초' 형태로 변환합니다."""
+    minutes = total_seconds // 60
+    seconds = total_seconds % 60
+    return f"{minutes}:{seconds:02d}"
+
+
+def format_duration(duration_str):
+    """ISO 8601 duration을 읽기 쉬운 형태로 변환"""
+    return format_seconds(parse_duration_seconds(duration_str))
+
+
+def _to_int(value):
+    """API가 문자열로 주는 통계 값을 정수로 변환합니다. (없거나 잘못된 값은 0)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class VideoView:
+    """화면 표시와 정렬·검색에 필요한 값만 담은 동영상 한 편의 정보입니다.
+
+    __slots__ 레코드라서 인스턴스마다 속성 딕셔너리가 없고, 통계는 정수로, 동영상 ID·분류·태그는
+    intern된 문자열로 보관합니다. 날짜·재생 시간 표시 문자열은 카드를 만들 때만 계산합니다.
+    원본 API 응답이 필요하면 Catalog.raw(video_id)로 꺼냅니다.
+    """
+
+    __slots__ = ("video_id", "title", "description", "tags", "thumbnail_url", "published_at",
+                 "duration_seconds", "view_count", "like_count", "category")
+
+    def __init__(self, video_id, title, description, thumbnail_url, published_at,
+                 duration_seconds=0, view_count=0, like_count=0, category="normal", tags=()):
+        self.video_id = sys.intern(video_id)
+        self.title = title
+        self.description = description
+        self.tags = tuple(sys.intern(tag) for tag in tags)
+        self.thumbnail_url = thumbnail_url
+        self.published_at = published_at
+        self.duration_seconds = duration_seconds
+        self.view_count = view_count
+        self.like_count = like_count
+        self.category = sys.intern(category)
+
+    @property
+    def published_label(self):
+        return format_date(self.published_at)
+
+    @property
+    def duration_label(self):
+        return format_seconds(self.duration_seconds)
+
+    @property
+    def url(self):
+        return f"https://www.youtube.com/watch?v={self.video_id}"
+
+    @classmethod
+    def from_video(cls, video_data, podcast_ids=()):
+        """캐시의 동영상 항목({"search_snippet", "details"})으로 VideoView를 만듭니다."""
+        snippet = video_data['search_snippet']
+        details = video_data['details']
+        statistics = details.get('statistics', {})
+        duration_seconds = parse_duration_seconds(details.get('contentDetails', {}).get('duration', 'PT0S'))
+        if details['id'] in podcast_ids:
+            category = "podcast"
+        elif duration_seconds <= SHORTS_MAX_SECONDS:
+            category = "short"
+        else:
+            category = "normal"
+        return cls(
+            video_id=details['id'],
+            title=snippet.get('title', ''),
+            description=snippet.get('description', ''),
+            thumbnail_url=snippet.get('thumbnails', {}).get('medium', {}).get('url', ''),
+            published_at=snippet.get('publishedAt', ''),
+            duration_seconds=duration_seconds,
+            view_count=_to_int(statistics.get('viewCount')),
+            like_count=_to_int(statistics.get('likeCount')),
+            category=category,
+            tags=details.get('snippet', {}).get('tags', ()),
+        )
+
+    @classmethod
+    def from_playlist_item(cls, item):
+        """팟캐스트 재생목록 항목(playlistItems 응답)으로 VideoView를 만듭니다."""
+        snippet = item['snippet']
+        return cls(
+            video_id=snippet['resourceId']['videoId'],
+            title=snippet.get('title', ''),
+            description=snippet.get('description', ''),
+            thumbnail_url=snippet.get('thumbnails', {}).get('medium', {}).get('url', ''),
+            published_at=snippet.get('publishedAt', ''),
+            category="podcast",
+        )
+
+
+def normalize_text(text):
+    """검색용 정규화: 유니코드 NFKC, 소문자화, 연속 공백을 하나로 줄임."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text or "")).strip().lower()
+
+
+def _normalized(text):
+    """normalize_text와 같지만, 정규화해도 그대로인 문자열(대부분의 한글 제목·설명)은 원본 객체를 공유합니다."""
+    normalized = normalize_text(text)
+    return text if normalized == text else normalized
+
+
+def _grams(text):
+    """공백을 뺀 문자열의 1글자·2글자 n-gram 집합을 반환합니다."""
+    compact = text.replace(" ", "")
+    grams = set(compact)
+    grams.update(compact[i:i+2] for i in range(len(compact) - 1))
+    return grams
+
+
+class SearchIndex:
+    """제목·설명·태그에 대한 문자 n-gram 역색인입니다.
+
+    질의어를 공백으로 나눈 각 단어의 n-gram 목록(posting)을 교집합하여 후보를 좁힌 뒤,
+    정규화된 필드에 실제로 포함되는지 확인하고 필드 가중치와 접두어 보너스로 점수를 매깁니다.
+    모든 단어가 어느 필드에든 포함된 동영상만 결과에 들어갑니다.
+    """
+
+    def __init__(self, videos):
+        self.videos = videos
+        self.fields = []
+        self.postings = {}
+        for doc_id, video in enumerate(videos):
+            fields = {
+                "title": _normalized(video.title),
+                "tags": normalize_text(" ".join(video.tags)),
+                "description": _normalized(video.description),
+            }
+            self.fields.append(fields)
+            for text in fields.values():
+                for gram in _grams(text):
+                    self.postings.setdefault(gram, set()).add(doc_id)
+        # 색인이 끝나면 posting을 정렬된 정수 배열로 바꿔 보관 (집합보다 n-gram당 메모리가 훨씬 적음)
+        self.postings = {gram: array('I', sorted(doc_ids)) for gram, doc_ids in self.postings.items()}
+
+    def _candidates(self, term):
+        """단어 하나의 n-gram을 모두 가진 문서 ID 집합을 반환합니다."""
+        compact = term.replace(" ", "")
+        grams = [compact[i:i+2] for i in range(len(compact) - 1)] or [compact]
+        # 가장 짧은 posting부터 교집합하여 비교 횟수를 줄임
+        postings = sorted((self.postings.get(gram, ()) for gram in set(grams)), key=len)
+        if not postings or not postings[0]:
+            return set()
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result.intersection_update(posting)
+            if not result:
+                break
+        return result
+
+    def _score(self, fields, term):
+        """필드에 단어가 포함되면 가중치를, 단어의 시작과 일치하면 보너스를 더한 점수를 반환합니다."""
+        score = 0.0
+        for name, text in fields.items():
+            position = text.find(term)
+            if position < 0:
+                # 띄어쓰기만 다른 경우(예: '주님과함께' ↔ '주님과 함께')는 접두어 보너스 없이 인정
+                if term.replace(" ", "") in text.replace(" ", ""):
+                    score += SEARCH_FIELD_WEIGHTS[name]
+                continue
+            score += SEARCH_FIELD_WEIGHTS[name]
+            if position == 0 or text[position - 1] == " ":
+                score += SEARCH_PREFIX_BONUS * SEARCH_FIELD_WEIGHTS[name]
+        return score
+
+    def search(self, query):
+        """질의어와 일치하는 (VideoView, 점수) 목록을 점수 높은 순으로 반환합니다."""
+        terms = normalize_text(query).split(" ")
+        terms = [term for term in terms if term]
+        if not terms:
+            return []
+
+        candidates = None
+        for term in sorted(terms, key=len, reverse=True):
+            term_candidates = self._candidates(term)
+            candidates = term_candidates if candidates is None else candidates & term_candidates
+            if not candidates:
+                return []
+
+        results = []
+        for doc_id in candidates:
+            fields = self.fields[doc_id]
+            total = 0.0
+            for term in terms:
+                score = self._score(fields, term)
+                if score == 0:
+                    break
+                total += score
+            else:
+                results.append((self.videos[doc_id], total))
+        # 점수가 같으면 최신 동영상 우선
+        results.sort(key=lambda r: (r[1], r[0].published_at), reverse=True)
+        return results
+
+
+class Catalog:
+    """스냅샷 하나의 분류된 동영상 목록입니다.
+
+    - videos: 채널 동영상 전체 (스냅샷 순서)
+    - normal / shorts: 팟캐스트를 제외한 일반 동영상 / Shorts
+    - podcasts: 팟캐스트 재생목록 (재생목록 순서)
+    - by_id: 동영상 ID → VideoView
+    - generation: 스냅샷의 generation 번호 (카드 HTML 캐시 키로 사용)
+    - search_index: 채널 동영상 검색 색인 (처음 검색할 때 한 번 생성)
+    - orders / ranks: 목록별·정렬 방식별 인덱스 배열. orders는 정렬된 순서의 위치,
+      ranks는 위치별 정렬 순위라서, 검색 결과를 정렬할 때 비교 키를 다시 계산하지 않습니다.
+    - raw_videos / raw_podcasts: 카탈로그를 만든 스냅샷의 원본 리스트
+    - raw_by_id: 동영상 ID → 원본 항목 (채널 동영상 우선, raw로 조회)
+    """
+
+    def __init__(self, videos, podcasts, generation=0, raw_videos=(), raw_podcasts=()):
+        self.generation = generation
+        self.videos = videos
+        self.podcasts = podcasts
+        self.raw_videos = raw_videos
+        self.raw_podcasts = raw_podcasts
+        self.normal = [v for v in videos if v.category == "normal"]
+        self.shorts = [v for v in videos if v.category == "short"]
+        self.by_id = {v.video_id: v for v in videos}
+        self.raw_by_id = {v.video_id: item for v, item in zip(podcasts, raw_podcasts)}
+        self.raw_by_id.update((v.video_id, item) for v, item in zip(videos, raw_videos))
+        self.lists = {"normal": self.normal, "shorts": self.shorts}
+        self.positions = {name: {v.video_id: i for i, v in enumerate(items)} for name, items in self.lists.items()}
+        self.orders = {}
+        self.ranks = {}
+        for name, items in self.lists.items():
+            self.orders[name] = {}
+            self.ranks[name] = {}
+            for sort_by, (key, reverse) in SORT_ORDERS.items():
+                # 같은 값끼리는 스냅샷 순서를 유지 (안정 정렬)
+                if reverse:
+                    order = sorted(range(len(items)), key=lambda i: (key(items[i]), -i), reverse=True)
+                else:
+                    order = sorted(range(len(items)), key=lambda i: key(items[i]))
+                rank = array('I', bytes(4 * len(items)))
+                for position, index in enumerate(order):
+                    rank[index] = position
+                self.orders[name][sort_by] = array('I', order)
+                self.ranks[name][sort_by] = rank
+        self._search_index = None
+        self._search_index_lock = threading.Lock()
+
+    @property
+    def search_index(self):
+        with self._search_index_lock:
+            if self._search_index is None:
+                self._search_index = SearchIndex(self.videos)
+            return self._search_index
+
+    def raw(self, video_id):
+        """동영상의 원본 API 항목(스냅샷의 videos 항목, 없으면 팟캐스트 재생목록 항목)을 반환합니다. 없으면 None.
+
+        VideoView에는 화면에 쓰는 필드만 있으므로, 그 밖의 값이 필요할 때 이 메서드로 원본을 꺼냅니다.
+        원본은 스냅샷 캐시와 공유되므로 수정하지 마세요.
+        """
+        return self.raw_by_id.get(video_id)
+
+    def search(self, query):
+        """검색어와 일치하는 채널 동영상의 {동영상 ID: 점수} 딕셔너리를 반환합니다."""
+        return {video.video_id: score for video, score in self.search_index.search(query)}
+
+    def select(self, name, sort_by, scores=None):
+        """목록(name: "normal"/"shorts")을 정렬 방식대로 반환합니다.
+
+        scores(검색 결과 {동영상 ID: 점수})가 주어지면 일치하는 동영상만, 미리 계산한 순위로 정렬해 반환합니다.
+        """
+        items = self.lists[name]
+        if sort_by not in SORT_ORDERS:
+            # 관련도순: 검색 점수 높은 순 (점수가 같으면 스냅샷 순서), 검색어가 없으면 스냅샷 순서
+            if scores is None:
+                return list(items)
+            positions = self.positions[name]
+            matched = [positions[video_id] for video_id in scores if video_id in positions]
+            matched.sort(key=lambda i: (-scores[items[i].video_id], i))
+            return [items[i] for i in matched]
+
+        if scores is None:
+            return [items[i] for i in self.orders[name][sort_by]]
+        # 검색 결과와 미리 정렬한 순서의 교집합: 일치한 k개만 순위 배열로 정렬 (O(k log k))
+        positions = self.positions[name]
+        rank = self.ranks[name][sort_by]
+        matched = sorted((positions[video_id] for video_id in scores if video_id in positions), key=rank.__getitem__)
+        return [items[i] for i in matched]
+
+
+def build_catalog(data):
+    """채널 스냅샷으로 Catalog를 만듭니다."""
+    podcast_items = data.get("podcast_videos", [])
+    video_items = data.get("videos", [])
+    podcasts = [VideoView.from_playlist_item(item) for item in podcast_items]
+    podcast_ids = {v.video_id for v in podcasts}
+    videos = [VideoView.from_video(video_data, podcast_ids) for video_data in video_items]
+    return Catalog(videos, podcasts, data.get("generation", 0), video_items, podcast_items)
+
+
+def get_catalog(data, path=None):
+    """스냅샷의 Catalog를 반환합니다. 같은 경로의 같은 스냅샷(같은 generation, 같은 리스트 객체)이면 이전에 만든 것을 재사용합니다.
+
+    path는 스냅샷 파일 경로로, 채널마다 카탈로그를 따로 보관하는 캐시 키입니다.
+    """
+    videos = data.get("videos", [])
+    podcast_items = data.get("podcast_videos", [])
+    with _catalog_cache_lock:
+        catalog = _catalog_cache.get(path)
+        if (catalog is not None and catalog.generation == data.get("generation", 0)
+                and catalog.raw_videos is videos and catalog.raw_podcasts is podcast_items):
+            _catalog_cache.move_to_end(path)
+            return catalog
+
+    catalog = build_catalog(data)
+    with _catalog_cache_lock:
+        # 카탈로그가 원본 리스트 객체를 보관하므로 id가 재사용되지 않고 `is` 비교가 안전함
+        _catalog_cache[path] = catalog
+        _catalog_cache.move_to_end(path)
+        while len(_catalog_cache) > CATALOG_CACHE_SIZE:
+            _catalog_cache.popitem(last=False)
+    return catalog
@@ -0,0 +1,180 @@
+"""
+방문자 수 카운터 모듈
+
+방문할 때마다 원격 저장소를 읽고 쓰는 대신, 프로세스 안에서 증가분을 모아 두었다가
+FLUSH_INTERVAL_SECONDS마다 한 번에 반영합니다. 반영은 여러 샤드 문서 중 하나에 대한 원자적 증가(increment)이므로
+동시에 여러 프로세스가 써도 증가분이 사라지지 않고, 문서 하나의 쓰기 속도 제한에도 걸리지 않습니다.
+화면에 표시하는 값은 반영 스레드가 CACHE_TTL_SECONDS마다 다시 읽어 두는 샤드 합계에 아직 반영하지 않은 증가분을
+더한 것이라서, 페이지 렌더링은 저장소 조회를 기다리지 않습니다.
+
+저장소(backend)는 increment(shard, amount)와 total() 두 메서드만 있으면 됩니다.
+- FirestoreCounterBackend: Firestore 샤드 문서 (app_stats/visitors/shards/<번호>)
+- SqliteCounterBackend: 로컬 SQLite 파일 (Firebase 설정이 없을 때, 또는 테스트용)
+- MemoryCounterBackend: 프로세스 메모리 (테스트용)
+"""
+import atexit
+import random
+import sqlite3
+import threading
+import time
+
+COUNTER_SHARDS = 10
+FLUSH_INTERVAL_SECONDS = 10
+CACHE_TTL_SECONDS = 60
+LOCAL_COUNTER_FILE = "visitor_counter.sqlite3"
+
+
+class FirestoreCounterBackend:
+    """Firestore의 샤드 카운터입니다. 기존 단일 문서(app_stats/visitors)의 count도 합계에 포함합니다."""
+
+    def __init__(self, db, collection="app_stats", document="visitors"):
+        from firebase_admin import firestore
+
+        self._increment = firestore.Increment
+        self.doc_ref = db.collection(collection).document(document)
+        self.shards = self.doc_ref.collection("shards")
+
+    def increment(self, shard, amount):
+        self.shards.document(str(shard)).set({"count": self._increment(amount)}, merge=True)
+
+    def total(self):
+        legacy = self.doc_ref.get()
+        base = (legacy.to_dict() or {}).get("count", 0) if legacy.exists else 0
+        return base + sum((doc.to_dict() or {}).get("count", 0) for doc in self.shards.stream())
+
+
+class SqliteCounterBackend:
+    """로컬 SQLite 파일의 샤드 카운터입니다. (UPSERT로 원자적으로 증가)"""
+
+    def __init__(self, path=LOCAL_COUNTER_FILE, name="visitors"):
+        self.path = path
+        self.name = name
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS counter_shards ("
+                         "name TEXT NOT NULL, shard INTEGER NOT NULL, count INTEGER NOT NULL, "
+                         "PRIMARY KEY (name, shard))")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def increment(self, shard, amount):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("INSERT INTO counter_shards VALUES (?, ?, ?) "
+                             "ON CONFLICT(name, shard) DO UPDATE SET count = count + excluded.count",
+                             (self.name, shard, amount))
+        finally:
+            conn.close()
+
+    def total(self):
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT COALESCE(SUM(count), 0) FROM counter_shards WHERE name = ?", (self.name,)).fetchone()
+        finally:
+            conn.close()
+        return row[0]
+
+
+class MemoryCounterBackend:
+    """프로세스 메모리의 샤드 카운터입니다. (테스트용)"""
+
+    def __init__(self):
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def increment(self, shard, amount):
+        with self._lock:
+            self.counts[shard] = self.counts.get(shard, 0) + amount
+
+    def total(self):
+        with self._lock:
+            return sum(self.counts.values())
+
+
+class BufferedCounter:
+    """증가분을 모아 주기적으로 샤드에 반영하고, 표시용 합계는 캐시하는 카운터입니다."""
+
+    def __init__(self, backend, shards=COUNTER_SHARDS, flush_interval=FLUSH_INTERVAL_SECONDS, cache_ttl=CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.shards = shards
+        self.flush_interval = flush_interval
+        self.cache_ttl = cache_ttl
+        self._pending = 0
+        self._flushing = 0
+        self._cached_total = None
+        self._cached_at = 0.0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """주기적으로 반영하는 데몬 스레드를 시작합니다. 프로세스가 끝날 때도 남은 증가분을 반영합니다."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="visitor-counter-flush", daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.flush()
+
+    def _run(self):
+        self.flush()  # 시작하자마자 합계를 읽어 둠
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def increment(self, amount=1):
+        """증가분을 모아 두고, 증가 후의 표시용 방문자 수를 반환합니다. (네트워크 호출 없음)"""
+        with self._lock:
+            self._pending += amount
+        return self.count()
+
+    def flush(self):
+        """모아 둔 증가분을 임의의 샤드 하나에 원자적으로 더하고, 표시용 합계가 CACHE_TTL_SECONDS보다 오래되었으면 다시 읽습니다.
+
+        반영에 실패하면 증가분을 되돌려 다음에 다시 시도합니다. 반영한 증가분을 반환합니다.
+        반영 스레드에서 호출되므로 저장소 호출은 페이지 렌더링과 겹치지 않습니다.
+        """
+        with self._flush_lock:
+            with self._lock:
+                amount, self._pending = self._pending, 0
+                self._flushing = amount
+            flushed = 0
+            if amount:
+                try:
+                    self.backend.increment(random.randrange(self.shards), amount)
+                    flushed = amount
+                except Exception as e:
+                    print(f"방문자 수를 반영하지 못했습니다: {e}")
+            with self._lock:
+                self._flushing = 0
+                if not flushed:
+                    self._pending += amount
+                elif self._cached_total is not None:
+                    self._cached_total += flushed
+                now = time.monotonic()
+                stale = self._cached_total is None or now - self._cached_at >= self.cache_ttl
+            if stale:
+                # 반영과 겹치지 않게(_flush_lock 안에서) 읽으므로 방금 반영한 증가분이 두 번 더해지지 않음
+                try:
+                    total = self.backend.total()
+                except Exception as e:
+                    print(f"방문자 수를 조회하지 못했습니다: {e}")
+                else:
+                    with self._lock:
+                        self._cached_total = total
+                        self._cached_at = now
+            return flushed
+
+    def count(self):
+        """표시용 방문자 수: 캐시된 샤드 합계 + 아직 반영하지 않은 증가분. 합계를 아직 읽지 못했으면 None.
+
+        메모리만 읽습니다. (합계는 flush가 갱신)
+        """
+        with self._lock:
+            if self._cached_total is None:
+                return None
+            return self._cached_total + self._pending + self._flushing
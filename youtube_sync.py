@@ -0,0 +1,1021 @@
+"""
+Haneul CCM 포트폴리오의 YouTube 데이터 동기화 모듈
+
+YouTube Data API 호출(공유 HTTP 세션, 재시도, ETag), 증분/전체 동기화, 캐시 파일 저장,
+동기화 조율(single-flight 잠금)과 백그라운드 갱신을 담당합니다.
+Streamlit 페이지(youtube_portfolio.py)와 cron/systemd에서 실행하는 CLI가 함께 사용합니다.
+
+    python youtube_sync.py            # 캐시가 오래되었을 때만 증분 동기화
+    python youtube_sync.py --full     # search API로 전체 동기화
+    python youtube_sync.py --loop --interval 3600   # 1시간마다 반복 실행
+"""
+import argparse
+import json
+import os
+import hashlib
+import math
+import random
+import sqlite3
+import sys
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from lazy_imports import LazyModule
+from snapshot_schema import (
+    CHANNEL_FIELDS,
+    PLAYLIST_ITEM_FIELDS,
+    SEARCH_ITEM_FIELDS,
+    UPLOAD_ITEM_FIELDS,
+    VIDEO_FIELDS,
+    fields_param,
+    normalize_snapshot,
+    search_snippet_from_details,
+    validate_video,
+)
+from snapshot_store import load_json_cached, load_snapshot_cached, save_snapshot, write_json_atomic
+from stats_history import HISTORY_FILE, record_snapshot_stats
+from thumbnail_cache import sync_thumbnails
+
+# HTTP 클라이언트는 실제로 API를 호출(또는 그 예외를 처리)할 때 처음 import (캐시만 읽는 페이지 시작을 빠르게)
+requests = LazyModule("requests")
+
+
+def get_secret(name, default=""):
+    """환경 변수 → Streamlit secrets 순서로 설정값을 읽습니다. (Streamlit 밖의 CLI에서도 동작)"""
+    value = os.environ.get(name)
+    if value:
+        return value
+    try:
+        import streamlit as st
+        return st.secrets.get(name, default)
+    except Exception:
+        return default
+
+
+# --- 보안 설정: 환경 변수 또는 st.secrets에서 API 정보 가져오기 ---
+YOUTUBE_API_KEY = get_secret("YOUTUBE_API_KEY")
+CHANNEL_ID = get_secret("CHANNEL_ID")
+PODCAST_PLAYLIST_ID = get_secret("PODCAST_PLAYLIST_ID")
+
+# 데이터 파일 경로 (.db/.sqlite/.sqlite3로 끝나면 SQLite 저장소 사용)
+DATA_FILE = get_secret("CHANNEL_DATA_FILE", "channel_data.json")
+# 리소스별 ETag와 마지막 확인 시각을 저장하는 파일 (304 응답이면 본문 파싱과 캐시 재작성을 건너뜀)
+ETAG_FILE = "channel_etags.json"
+
+# HTTP 요청 설정: (연결, 읽기) 타임아웃(초), 재시도 횟수, 백오프 기본/최대 대기 시간(초)
+REQUEST_TIMEOUT = (5, 20)
+MAX_RETRIES = 3
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 8
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# 캐시 유효 시간(시간): 이보다 오래된 데이터는 다시 동기화
+REFRESH_INTERVAL_HOURS = 24
+# 동기화 조율 설정
+# - STALE_WHILE_REVALIDATE: 캐시가 오래되었어도 기존 데이터로 바로 렌더링하고 동기화는 백그라운드에서 수행
+# - REFRESH_LOCK_FILE: 여러 프로세스가 동시에 동기화하지 않도록 하는 잠금 파일
+# - REFRESH_LOCK_STALE_SECONDS: 이 시간보다 오래된 잠금 파일은 비정상 종료로 남은 것으로 보고 정리
+# - REFRESH_WAIT_SECONDS: 보여줄 데이터가 전혀 없을 때 다른 세션의 동기화를 기다리는 최대 시간
+STALE_WHILE_REVALIDATE = True
+REFRESH_LOCK_FILE = DATA_FILE + ".lock"
+REFRESH_LOCK_STALE_SECONDS = 600
+REFRESH_WAIT_SECONDS = 60
+# - REFRESH_RETRY_COOLDOWN_SECONDS: 동기화가 실패한 뒤 페이지가 다시 동기화를 시작하지 않고 기다리는 시간
+REFRESH_RETRY_COOLDOWN_SECONDS = 15 * 60
+# 동영상 상세 정보(50개 단위 묶음)를 동시에 요청할 최대 스레드 수 (API 속도 제한을 넘지 않도록 작게 유지)
+MAX_DETAIL_WORKERS = 4
+
+# API 할당량(쿼터) 설정
+# - QUOTA_COSTS: 엔드포인트별 호출 1회당 소모 단위 (YouTube Data API v3 기준)
+# - DAILY_QUOTA: API 키의 일일 할당량 (태평양 시간 자정에 초기화)
+# - QUOTA_RESERVE_RATIO: 비싼 search 전체 동기화가 남겨 두어야 하는 할당량 비율
+# - QUOTA_LOW_RATIO / QUOTA_BACKOFF_FACTOR: 남은 할당량이 이 비율 이하면 갱신 주기를 이 배수만큼 늘림
+QUOTA_LEDGER_FILE = "quota_ledger.json"
+QUOTA_LEDGER_DAYS = 30
+QUOTA_COSTS = {"search": 100, "videos": 1, "playlistItems": 1, "channels": 1}
+DAILY_QUOTA = int(get_secret("YOUTUBE_DAILY_QUOTA", "10000") or 10000)
+QUOTA_RESERVE_RATIO = 0.2
+QUOTA_LOW_RATIO = 0.2
+QUOTA_BACKOFF_FACTOR = 4
+
+# 프로세스 전체에서 공유하는 객체 (모듈은 한 번만 import되므로 Streamlit 재실행 사이에도 유지됨)
+_http_session = None
+_http_session_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_refresher_thread = None
+_refresher_lock = threading.Lock()
+_quota_lock = threading.Lock()
+_quota_pending = {}
+
+def get_default_data():
+    """데이터 파일이 없거나 손상되었을 때 사용할 기본 데이터 구조를 반환합니다."""
+    return {
+        "channel_info": {
+            "snippet": {"title": "Haneul CCM", "description": "CCM 작곡가 하늘의 음악 세계에 오신 것을 환영합니다."},
+            "statistics": {"subscriberCount": "0", "videoCount": "0", "viewCount": "0"}
+        },
+        "videos": [],
+        "podcast_videos": [],
+        "last_updated": "1970-01-01T00:00:00Z"  # 최초 실행 시 무조건 업데이트되도록 아주 오래된 시간으로 설정
+    }
+
+def load_channel_data(warn=print, path=None):
+    """JSON 파일에서 채널 데이터를 로드하고 데이터 구조를 검증합니다.
+
+    반환된 데이터의 하위 리스트·딕셔너리는 다른 세션과 공유되므로 수정하지 말고 새 객체를 만들어 쓰세요.
+    warn은 경고 메시지를 표시할 함수입니다. (Streamlit 페이지에서는 st.warning을 넘김)
+    path는 스냅샷 파일 경로입니다. (기본 DATA_FILE, 채널 레지스트리의 다른 채널은 채널별 파일)
+    """
+    path = path or DATA_FILE
+    try:
+        # 원자적으로 교체된 완전한 스냅샷만 읽음 (본 파일이 손상되었으면 보관된 이전 스냅샷 사용)
+        # 파싱·검증 결과는 파일이 바뀔 때까지 프로세스 전체에서 재사용
+        data, problem = load_snapshot_cached(path, check_channel_data)
+        if problem:
+            warn(problem)
+        if data is not None:
+            # 공유 캐시를 건드리지 않도록 최상위 딕셔너리만 복사해 세션별 값을 덧붙임
+            data = dict(data)
+            state = peek_etag_state()
+            data["last_checked"] = get_last_checked(state, path)
+            data["last_failed"] = state.get("last_failed", {}).get(path)
+            return data
+    except (ValueError, EOFError, OSError, sqlite3.DatabaseError):
+        warn("데이터 파일을 읽을 수 없어 기본 데이터로 시작합니다.")
+    return get_default_data()
+
+def check_channel_data(data):
+    """스냅샷 구조를 검증하여 (data, 문제 설명) 튜플을 반환합니다. 정상이면 문제 설명은 None입니다.
+
+    동기화 형식이 아닌 동영상 레코드(데이터 관리 도구로 직접 입력한 항목, 손상된 항목)는 스냅샷 전체를
+    버리지 않고 그 레코드만 건너뛴 데이터와 경고 메시지를 반환합니다. (원본 파일은 그대로 둠)
+    """
+    if data is None:
+        return None, None
+    if "channel_info" not in data or "videos" not in data:
+        return None, None
+    # 데이터 구조 검증 (첫 항목만이 아니라 모든 동영상 레코드)
+    valid, skipped = [], []
+    for index, video in enumerate(data["videos"]):
+        try:
+            validate_video(video)
+        except ValueError as e:
+            skipped.append((index, e))
+        else:
+            valid.append(video)
+    if not skipped:
+        return data, None
+    data = dict(data, videos=valid)
+    if not valid:
+        return data, "이전 버전의 데이터 파일(channel_data.json)이 감지되었습니다. 새 데이터 구조로 업데이트가 필요합니다."
+    index, error = skipped[0]
+    return data, f"데이터 파일의 동영상 레코드 {len(skipped)}개를 표시할 수 없어 건너뜁니다. ({index + 1}번째: {error})"
+
+class EtagCache(dict):
+    """리소스 키 → ETag 딕셔너리입니다. 이번 동기화에서 쓴 키(used)를 기억해, 쓰지 않은 키를 정리할 수 있게 합니다."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.used = set()
+
+    def pruned(self):
+        """이번 동기화에서 쓴 키만 남긴 딕셔너리를 반환합니다."""
+        return {key: etag for key, etag in self.items() if key in self.used}
+
+def load_etag_state():
+    """동기화에 쓸 ETag 상태를 파일에서 새로 읽습니다. 파일이 없거나 손상되었으면 빈 상태를 반환합니다."""
+    if os.path.exists(ETAG_FILE):
+        try:
+            with open(ETAG_FILE, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+                if isinstance(state.get("etags"), dict):
+                    state["etags"] = EtagCache(state["etags"])
+                    return state
+        except (json.JSONDecodeError, OSError):
+            pass
+    return {"etags": EtagCache(), "last_checked": None}
+
+def peek_etag_state():
+    """페이지 재실행에서 읽는 ETag 상태(마지막 확인 시각 등)입니다.
+
+    파일이 바뀔 때까지 프로세스 전체에서 재사용하므로 수정하지 마세요. (동기화에는 load_etag_state)
+    """
+    state = load_json_cached(ETAG_FILE)
+    return state if isinstance(state, dict) else {}
+
+def get_last_checked(state, path=None):
+    """스냅샷 파일의 마지막 확인 시각을 ETag 상태에서 꺼냅니다. (DATA_FILE은 기존 위치에 저장)"""
+    if not path or path == DATA_FILE:
+        return state.get("last_checked")
+    return state.get("last_checked_files", {}).get(path)
+
+def set_last_checked(state, path, value):
+    if not path or path == DATA_FILE:
+        state["last_checked"] = value
+    else:
+        state.setdefault("last_checked_files", {})[path] = value
+
+def record_refresh_failure(paths):
+    """스냅샷 파일들의 동기화 실패 시각을 ETag 상태에 기록합니다. (페이지가 REFRESH_RETRY_COOLDOWN_SECONDS 동안 다시 시도하지 않도록)
+
+    실패한 동기화가 받은 ETag는 저장하면 안 되므로 파일에서 상태를 새로 읽어 실패 시각만 덧붙입니다.
+    """
+    state = load_etag_state()
+    failed_at = datetime.utcnow().isoformat() + 'Z'
+    for path in paths:
+        state.setdefault("last_failed", {})[path] = failed_at
+    save_etag_state(state)
+
+def save_etag_state(state, prune=False):
+    """ETag 상태를 저장합니다. 실패해도 다음 동기화가 전체 응답을 받을 뿐이므로 로그만 남깁니다.
+
+    prune=True이면 이번 동기화에서 쓰지 않은 ETag(지난 업로드 확인이나 전체 동기화의 videos 묶음 등)를 지웁니다.
+    """
+    if prune and isinstance(state.get("etags"), EtagCache):
+        state = dict(state, etags=state["etags"].pruned())
+    try:
+        write_json_atomic(ETAG_FILE, state)
+    except OSError as e:
+        print(f"ETag 파일 저장 중 오류가 발생했습니다: {e}")
+
+def quota_today():
+    """할당량 기준 날짜(태평양 시간, YYYY-MM-DD)를 반환합니다."""
+    try:
+        from zoneinfo import ZoneInfo
+        pacific = ZoneInfo("America/Los_Angeles")
+    except Exception:
+        pacific = timezone(timedelta(hours=-8))  # tzdata가 없는 환경에서는 고정 오프셋 사용
+    return datetime.now(pacific).strftime('%Y-%m-%d')
+
+def seconds_until_quota_reset():
+    """다음 할당량 초기화(태평양 시간 자정)까지 남은 시간(초)을 반환합니다."""
+    now = datetime.now(timezone.utc)
+    try:
+        from zoneinfo import ZoneInfo
+        local_now = now.astimezone(ZoneInfo("America/Los_Angeles"))
+    except Exception:
+        local_now = now.astimezone(timezone(timedelta(hours=-8)))
+    tomorrow = (local_now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return max(60, int((tomorrow - local_now).total_seconds()))
+
+def load_quota_ledger():
+    """일별·엔드포인트별 할당량 사용 기록을 읽습니다. {"YYYY-MM-DD": {"search": 100, ...}}"""
+    if os.path.exists(QUOTA_LEDGER_FILE):
+        try:
+            with open(QUOTA_LEDGER_FILE, 'r', encoding='utf-8') as f:
+                ledger = json.load(f)
+                if isinstance(ledger, dict):
+                    return ledger
+        except (json.JSONDecodeError, OSError):
+            pass
+    return {}
+
+def record_quota(endpoint, units=None):
+    """API 호출 1회의 할당량 사용을 메모리에 기록합니다. (flush_quota_ledger로 파일에 반영)"""
+    units = QUOTA_COSTS.get(endpoint, 1) if units is None else units
+    with _quota_lock:
+        _quota_pending[endpoint] = _quota_pending.get(endpoint, 0) + units
+
+def mark_quota_exhausted():
+    """API가 quotaExceeded로 응답하면 오늘은 할당량이 바닥난 것으로 기록합니다."""
+    with _quota_lock:
+        _quota_pending["exhausted"] = True
+
+def flush_quota_ledger():
+    """메모리에 쌓인 사용량을 오늘 날짜의 기록에 더해 저장하고, 오래된 날짜는 정리합니다."""
+    with _quota_lock:
+        if not _quota_pending:
+            return
+        pending = dict(_quota_pending)
+        _quota_pending.clear()
+    ledger = load_quota_ledger()
+    today = ledger.setdefault(quota_today(), {})
+    for endpoint, units in pending.items():
+        if endpoint == "exhausted":
+            today["exhausted"] = True
+        else:
+            today[endpoint] = today.get(endpoint, 0) + units
+    for day in sorted(ledger)[:-QUOTA_LEDGER_DAYS]:
+        del ledger[day]
+    try:
+        write_json_atomic(QUOTA_LEDGER_FILE, ledger, indent=2)
+    except OSError as e:
+        print(f"할당량 기록 파일 저장 중 오류가 발생했습니다: {e}")
+
+def quota_usage_today():
+    """오늘 엔드포인트별 사용량(아직 저장되지 않은 사용량 포함)을 반환합니다."""
+    usage = dict(load_quota_ledger().get(quota_today(), {}))
+    with _quota_lock:
+        for endpoint, units in _quota_pending.items():
+            usage[endpoint] = True if endpoint == "exhausted" else usage.get(endpoint, 0) + units
+    return usage
+
+def quota_remaining():
+    """오늘 남은 할당량 추정치를 반환합니다."""
+    usage = quota_usage_today()
+    if usage.get("exhausted"):
+        return 0
+    used = sum(units for endpoint, units in usage.items() if endpoint != "exhausted")
+    return max(0, DAILY_QUOTA - used)
+
+def estimate_sync_cost(data, strategy):
+    """동기화 방식별 예상 할당량 사용량을 계산합니다."""
+    stats = data.get("channel_info", {}).get("statistics", {})
+    try:
+        video_count = int(stats.get("videoCount", "0"))
+    except ValueError:
+        video_count = 0
+    pages = max(1, math.ceil(max(video_count, len(data.get("videos", []))) / 50))
+    base = QUOTA_COSTS["channels"] + QUOTA_COSTS["playlistItems"]  # 채널 정보 + 팟캐스트 재생목록
+    if strategy == "search":
+        return base + pages * (QUOTA_COSTS["search"] + QUOTA_COSTS["videos"])
+    if strategy == "uploads" or not data.get("videos"):
+        return base + pages * (QUOTA_COSTS["playlistItems"] + QUOTA_COSTS["videos"])
+    # 증분: 새 업로드 확인 + 기존 동영상 통계 갱신(50개 묶음당 1단위)
+    return base + QUOTA_COSTS["playlistItems"] + (pages + 1) * QUOTA_COSTS["videos"]
+
+def choose_sync_strategy(data, full=False):
+    """남은 할당량에 맞는 동기화 방식을 고릅니다. 할당량이 모자라면 None을 반환합니다.
+
+    - "search": search API로 전체 동기화 (가장 비쌈, 페이지당 100단위)
+    - "uploads": 업로드 재생목록 전체를 훑는 전체 동기화 (페이지당 1단위)
+    - "incremental": 새 업로드만 합치는 증분 동기화
+    """
+    remaining = quota_remaining()
+    reserve = DAILY_QUOTA * QUOTA_RESERVE_RATIO
+    if full:
+        if remaining - estimate_sync_cost(data, "search") >= reserve:
+            return "search"
+        if remaining >= estimate_sync_cost(data, "uploads"):
+            print("남은 할당량이 적어 search 대신 업로드 재생목록으로 전체 동기화합니다.")
+            return "uploads"
+    if remaining >= estimate_sync_cost(data, "incremental"):
+        return "incremental"
+    return None
+
+def next_refresh_delay(interval_seconds):
+    """남은 할당량에 따라 다음 갱신까지 기다릴 시간(초)을 정합니다."""
+    if quota_remaining() <= DAILY_QUOTA * QUOTA_LOW_RATIO:
+        return max(interval_seconds, min(interval_seconds * QUOTA_BACKOFF_FACTOR, seconds_until_quota_reset()))
+    return interval_seconds
+
+def get_http_session():
+    """모든 YouTube 요청이 함께 쓰는 HTTP 세션을 만듭니다.
+
+    프로세스당 한 번만 생성되므로 모든 세션·페이지 요청이 keep-alive 연결 풀을 공유하여
+    매 요청마다 TCP+TLS 핸드셰이크를 반복하지 않습니다.
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            session.mount("https://", adapter)
+            _http_session = session
+        return _http_session
+
+def _retry_delay(attempt, response=None):
+    """재시도 전 대기 시간: Retry-After 헤더가 있으면 따르고, 없으면 지터를 준 지수 백오프를 사용합니다."""
+    if response is not None:
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(int(retry_after), RETRY_BACKOFF_MAX)
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** attempt)))
+
+def api_get(url, params, etags=None, etag_key=None, session=None):
+    """YouTube API GET 요청을 보내고 JSON 응답을 반환합니다.
+
+    공유 세션과 타임아웃을 사용하며, 연결 오류·타임아웃과 일시적인 5xx/429 응답은
+    최대 MAX_RETRIES번까지 지터를 준 지수 백오프로 재시도합니다.
+    응답을 받은 호출마다 엔드포인트별 할당량 사용량을 기록합니다.
+    etags 딕셔너리와 etag_key가 주어지면 저장된 ETag로 If-None-Match 헤더를 보내고,
+    서버가 304(변경 없음)로 응답하면 본문을 파싱하지 않고 None을 반환합니다.
+    """
+    headers = {}
+    if etags is not None and etag_key:
+        if isinstance(etags, EtagCache):
+            etags.used.add(etag_key)
+        if etag_key in etags:
+            headers['If-None-Match'] = etags[etag_key]
+
+    session = session or get_http_session()
+    endpoint = url.rstrip('/').rsplit('/', 1)[-1]
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt == MAX_RETRIES:
+                raise
+            time.sleep(_retry_delay(attempt))
+            continue
+        record_quota(endpoint)
+        if response.status_code in RETRY_STATUS_CODES and attempt < MAX_RETRIES:
+            time.sleep(_retry_delay(attempt, response))
+            continue
+        break
+
+    if response.status_code == 304:
+        return None
+    if response.status_code == 403 and 'quotaExceeded' in response.text:
+        mark_quota_exhausted()
+    response.raise_for_status()
+    data = response.json()
+
+    if etags is not None and etag_key:
+        etag = response.headers.get('ETag') or data.get('etag')
+        if etag:
+            etags[etag_key] = etag
+    return data
+
+def needs_update(data, max_age=None):
+    """데이터를 마지막으로 업데이트(또는 변경 없음을 확인)한 지 max_age(기본 REFRESH_INTERVAL_HOURS)가 지났는지 확인합니다."""
+    try:
+        last_updated_str = data.get("last_updated", "1970-01-01T00:00:00Z")
+        # Python 3.10 or lower doesn't handle 'Z' suffix well, so we replace it
+        last_updated = datetime.fromisoformat(last_updated_str.replace('Z', '+00:00'))
+        last_checked_str = data.get("last_checked")
+        if last_checked_str:
+            last_updated = max(last_updated, datetime.fromisoformat(last_checked_str.replace('Z', '+00:00')))
+        return datetime.now(last_updated.tzinfo) - last_updated > (max_age if max_age is not None else timedelta(hours=REFRESH_INTERVAL_HOURS))
+    except Exception as e:
+        print(f"업데이트 시간 확인 중 오류 발생: {e}")
+        return True # 오류 발생 시 업데이트 시도
+
+def refresh_due(data, max_age=None):
+    """페이지가 동기화를 시작해야 하면 True: 데이터가 오래되었고, 최근 REFRESH_RETRY_COOLDOWN_SECONDS 안에 실패한 적이 없을 때.
+
+    실패한 직후에는 needs_update가 계속 True이므로, 이 대기 시간이 없으면 모든 재실행이 동기화를 다시 시작합니다.
+    """
+    if not needs_update(data, max_age):
+        return False
+    last_failed = data.get("last_failed")
+    if last_failed:
+        try:
+            failed_at = datetime.fromisoformat(last_failed.replace('Z', '+00:00'))
+        except ValueError:
+            return True
+        return datetime.now(failed_at.tzinfo) - failed_at > timedelta(seconds=REFRESH_RETRY_COOLDOWN_SECONDS)
+    return True
+
+def get_uploads_playlist_id(channel_info):
+    """채널 정보에서 '업로드' 재생목록 ID를 꺼냅니다. 정보가 없으면 채널 ID(UC...)로부터 유추합니다."""
+    uploads = channel_info.get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads')
+    if uploads:
+        return uploads
+    channel_id = channel_info.get('id') or CHANNEL_ID
+    if channel_id and channel_id.startswith('UC'):
+        return 'UU' + channel_id[2:]
+    return None
+
+def get_sync_state(videos):
+    """캐시된 동영상 목록에서 증분 동기화 기준점(가장 최근 동영상의 ID와 게시 시각)을 계산합니다."""
+    if not videos:
+        return {}
+    newest = max(videos, key=lambda v: v['search_snippet'].get('publishedAt', ''))
+    return {
+        "last_video_id": newest['details']['id'],
+        "last_published_at": newest['search_snippet'].get('publishedAt', '')
+    }
+
+def fetch_and_cache_youtube_data(full=False, strategy=None):
+    """YouTube API에서 최신 데이터를 가져와 JSON 파일로 저장(캐시)합니다.
+
+    기본은 증분 동기화입니다. 채널의 업로드 재생목록을 최신순으로 훑다가 마지막으로 저장한
+    동영상(sync_state)에 도달하면 멈추고, 새 동영상만 기존 목록 앞에 합칩니다.
+    기존 동영상의 통계는 같은 videos.list 묶음 조회로 함께 갱신합니다.
+    full=True(strategy="search")이면 search API로 전체 목록을 다시 가져오고,
+    strategy="uploads"이거나 캐시가 비어 있으면 업로드 재생목록 전체를 훑어 더 싸게 전체 목록을 만듭니다.
+    팟캐스트 재생목록은 채널 동기화와 병렬로 가져옵니다.
+    """
+    strategy = strategy or ("search" if full else "incremental")
+    cached_data = load_channel_data()
+    cached_videos = cached_data.get("videos", [])
+    cached_details = {v['details']['id']: v['details'] for v in cached_videos}
+    etag_state = load_etag_state()
+    etags = etag_state["etags"]
+
+    session = get_http_session()
+    with ThreadPoolExecutor(max_workers=MAX_DETAIL_WORKERS + 1) as executor:
+        # 팟캐스트 플레이리스트 동영상은 채널 동영상 동기화와 병렬로 미리 요청
+        podcast_future = executor.submit(get_playlist_videos, PODCAST_PLAYLIST_ID, etags, cached_data.get("podcast_videos") or None, session)
+
+        # 1. 채널 정보 가져오기 (변경이 없으면 캐시된 정보를 그대로 사용)
+        cached_channel_info = cached_data.get("channel_info") if "id" in cached_data.get("channel_info", {}) else None
+        channel_info = get_channel_info(etags, cached_channel_info)
+        if not channel_info:
+            print("채널 정보를 가져올 수 없어 캐싱을 중단합니다.")
+            return None
+
+        processed_videos = sync_channel_videos(channel_info, cached_data, cached_details, etags, strategy, executor, session)
+        if processed_videos is None:
+            return None
+
+        # 3. 팟캐스트 플레이리스트 결과 합류
+        podcast_playlist_items = podcast_future.result()
+
+    # 4. 최종 데이터 객체 생성 및 저장
+    new_data = build_snapshot(channel_info, processed_videos, podcast_playlist_items)
+    saved = commit_snapshot(DATA_FILE, new_data, cached_data, etag_state, session)
+    if saved is not None:
+        save_etag_state(etag_state, prune=True)
+    return saved
+
+def build_snapshot(channel_info, videos, podcast_items):
+    """동기화 결과로 저장할 스냅샷 딕셔너리를 만듭니다. (저장 형식에 없는 필드는 버림)"""
+    return normalize_snapshot({
+        "channel_info": channel_info,
+        "videos": videos,
+        "podcast_videos": podcast_items,
+        "sync_state": dict(get_sync_state(videos), uploads_playlist_id=get_uploads_playlist_id(channel_info)),
+        "last_updated": datetime.utcnow().isoformat() + 'Z'
+    })
+
+def commit_snapshot(path, new_data, cached_data, etag_state, session=None, history_path=HISTORY_FILE, thumbnails=True):
+    """새 스냅샷을 저장한 뒤 썸네일 캐시·통계 이력을 갱신합니다. 저장에 실패하면 None을 반환합니다.
+
+    내용이 그대로라면 큰 캐시 파일을 다시 쓰지 않고 etag_state에 확인 시각만 기록합니다.
+    etag_state 저장은 호출한 쪽에서 합니다. (스냅샷 저장에 실패했으면 저장하지 말 것)
+    """
+    set_last_checked(etag_state, path, new_data["last_updated"])
+    etag_state.get("last_failed", {}).pop(path, None)
+    unchanged = all(new_data[key] == cached_data.get(key) for key in ("channel_info", "videos", "podcast_videos", "sync_state"))
+    if unchanged:
+        cached_data = dict(cached_data, last_checked=new_data["last_updated"])
+        return cached_data
+
+    try:
+        save_snapshot(path, new_data, previous=cached_data)
+    except Exception as e:
+        print(f"캐시 파일 저장 중 오류가 발생했습니다: {e}")
+        return None
+
+    # 통계 이력 기록 (바뀐 통계만 덧붙임, 실패해도 동기화 결과에는 영향 없음)
+    try:
+        record_snapshot_stats(new_data, history_path)
+    except Exception as e:
+        print(f"통계 이력을 기록하지 못했습니다: {e}")
+
+    # 썸네일 캐시 채우기 (새 스냅샷을 먼저 공개한 뒤 수행, 실패해도 페이지는 원래 썸네일 주소를 사용)
+    if thumbnails:
+        try:
+            sync_thumbnails(new_data, session)
+        except Exception as e:
+            print(f"썸네일 캐시를 갱신하지 못했습니다: {e}")
+    return new_data
+
+def get_refresh_lock():
+    """프로세스 안의 모든 세션이 공유하는 동기화 잠금을 반환합니다."""
+    return _refresh_lock
+
+def acquire_file_lock(timeout=0):
+    """여러 프로세스 사이의 동기화 잠금 파일을 만듭니다. timeout(초) 안에 얻지 못하면 False를 반환합니다."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(REFRESH_LOCK_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            with os.fdopen(fd, 'w') as f:
+                f.write(f"{os.getpid()} {datetime.utcnow().isoformat()}Z")
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(REFRESH_LOCK_FILE) > REFRESH_LOCK_STALE_SECONDS:
+                    os.remove(REFRESH_LOCK_FILE)  # 비정상 종료로 남은 잠금 정리 후 다시 시도
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.5)
+
+def release_file_lock():
+    """동기화 잠금 파일을 삭제합니다."""
+    try:
+        os.remove(REFRESH_LOCK_FILE)
+    except FileNotFoundError:
+        pass
+
+def refresh_channel_data(full=False, wait=False, max_age=None):
+    """동시에 하나의 동기화만 실행되도록(single-flight) 조율하여 데이터를 갱신합니다.
+
+    다른 세션이나 프로세스가 이미 동기화 중이면 wait=False일 때는 기다리지 않고 None을 반환하고,
+    wait=True일 때는 그 동기화가 끝나기를 기다렸다가 새로 저장된 데이터를 반환합니다.
+    잠금을 얻은 뒤 다른 쪽이 방금 갱신을 마쳤다면 API를 다시 호출하지 않으며,
+    남은 할당량에 맞춰 동기화 방식을 고릅니다(choose_sync_strategy).
+    """
+    timeout = REFRESH_WAIT_SECONDS if wait else 0
+    lock = get_refresh_lock()
+    if not lock.acquire(timeout=timeout):
+        return None
+    try:
+        if not acquire_file_lock(timeout):
+            return None
+        result = None
+        try:
+            latest_data = load_channel_data()
+            if not full and not needs_update(latest_data, max_age):
+                result = latest_data
+                return result
+            strategy = choose_sync_strategy(latest_data, full)
+            if strategy is None:
+                print(f"오늘 남은 API 할당량({quota_remaining()})이 부족하여 동기화를 건너뜁니다.")
+                return None
+            result = fetch_and_cache_youtube_data(strategy=strategy)
+            return result
+        finally:
+            if result is None:
+                record_refresh_failure([DATA_FILE])
+            flush_quota_ledger()
+            release_file_lock()
+    finally:
+        lock.release()
+
+def is_refresh_running():
+    """이 프로세스나 다른 프로세스에서 동기화가 진행 중인지 확인합니다."""
+    return get_refresh_lock().locked() or os.path.exists(REFRESH_LOCK_FILE)
+
+def start_background_refresh():
+    """stale-while-revalidate: 페이지 렌더링을 막지 않도록 동기화를 데몬 스레드에서 시작합니다."""
+    if is_refresh_running():
+        return False
+    threading.Thread(target=refresh_channel_data, name="channel-data-refresh", daemon=True).start()
+    return True
+
+def run_refresh_loop(interval_seconds, stop_event=None):
+    """interval_seconds마다 캐시를 확인하고, 그보다 오래된 데이터만 동기화하는 반복 루프입니다.
+
+    남은 할당량이 적으면 다음 실행까지의 간격을 늘립니다(next_refresh_delay).
+    """
+    stop_event = stop_event or threading.Event()
+    max_age = timedelta(seconds=interval_seconds)
+    while not stop_event.is_set():
+        try:
+            refresh_channel_data(max_age=max_age)
+        except Exception as e:
+            # 한 번의 실패로 갱신 스레드가 죽지 않도록 로그만 남기고 다음 주기에 다시 시도
+            print(f"백그라운드 동기화 중 오류가 발생했습니다: {e}")
+        stop_event.wait(next_refresh_delay(interval_seconds))
+
+def start_background_refresher(interval_seconds=None):
+    """페이지 렌더링과 분리된 백그라운드 갱신 스레드를 프로세스당 하나만 시작합니다."""
+    global _refresher_thread
+    with _refresher_lock:
+        if _refresher_thread is None or not _refresher_thread.is_alive():
+            interval_seconds = interval_seconds or REFRESH_INTERVAL_HOURS * 3600
+            _refresher_thread = threading.Thread(target=run_refresh_loop, args=(interval_seconds,), name="channel-data-refresher", daemon=True)
+            _refresher_thread.start()
+    return _refresher_thread
+
+def sync_channel_videos(channel_info, cached_data, cached_details, etags, strategy, executor, session):
+    """채널 동영상 목록(search_snippet + details)을 동기화합니다. 실패 시 None을 반환합니다."""
+    cached_videos = cached_data.get("videos", [])
+    sync_state = cached_data.get("sync_state") or get_sync_state(cached_videos)
+    uploads_playlist_id = get_uploads_playlist_id(channel_info)
+
+    if strategy in ("incremental", "uploads") and uploads_playlist_id:
+        # 2-a. 업로드 재생목록 동기화
+        # 증분: 새 동영상 ID만 수집해 기존 목록 앞에 합침 / 전체("uploads" 또는 빈 캐시): 재생목록 전체를 훑음
+        incremental = strategy == "incremental" and bool(cached_videos)
+        if incremental:
+            known_ids = {v['details']['id'] for v in cached_videos}
+            new_video_ids = get_new_uploads(uploads_playlist_id, known_ids, sync_state.get('last_published_at'), etags)
+        else:
+            new_video_ids = get_new_uploads(uploads_playlist_id, set())
+        if new_video_ids is None:
+            print("업로드 재생목록을 가져오지 못했습니다. API 할당량 초과일 수 있으므로 캐싱을 중단합니다.")
+            return None
+
+        # 증분 동기화도 기존 동영상의 통계(조회수·좋아요 등)를 갱신하도록 기존 ID를 함께 조회 (stats_refresh_ids 참고)
+        refresh_ids = stats_refresh_ids(cached_videos) if incremental else []
+        lookup_ids = refresh_ids + new_video_ids
+        video_details = get_video_details(lookup_ids, etags, cached_details) if lookup_ids else {}
+        new_videos = new_upload_videos(new_video_ids, video_details, etags, uploads_playlist_id if incremental else None)
+        processed_videos = new_videos + merge_video_details(cached_videos, video_details) if incremental else new_videos
+    else:
+        # 2-b. 전체 동기화: 검색 페이지가 도착하는 즉시 그 페이지의 상세 정보 요청을 시작
+        # (목록 페이지 수집과 상세 조회가 겹쳐 진행되고, 처리 중인 원본 페이지는 MAX_DETAIL_WORKERS개로 제한)
+        # 목록이 바뀌지 않았으면(304) 캐시된 순서를 그대로 재사용 (search 결과는 순서만 쓰고 snippet은 상세 정보에서 만듦)
+        cached_search = [{"id": {"videoId": v['details']['id']}} for v in cached_videos]
+        processed_videos = []
+        pending = deque()
+
+        def collect(page, future):
+            video_details = future.result()
+            for video in page:
+                video_id = video['id']['videoId']
+                if video_details.get(video_id):
+                    processed_videos.append({
+                        "search_snippet": search_snippet_from_details(video_details[video_id]),
+                        "details": video_details[video_id]
+                    })
+
+        try:
+            for page in iter_video_pages(etags, cached_search or None, session):
+                page_ids = [v['id']['videoId'] for v in page]
+                pending.append((page, executor.submit(_get_video_details_batch, page_ids, etags, cached_details, session)))
+                while pending and (len(pending) >= MAX_DETAIL_WORKERS or pending[0][1].done()):
+                    collect(*pending.popleft())
+            while pending:
+                collect(*pending.popleft())
+        except requests.exceptions.RequestException as e:
+            print(f"전체 동영상 목록을 가져오는 중 오류가 발생했습니다: {e}")
+            processed_videos = []
+
+        # 중요: 채널 통계상 동영상은 있는데, API로 하나도 못가져왔다면 오류로 간주하고 캐싱 중단
+        # 이렇게 해야 할당량 초과 등으로 빈 목록이 기존 캐시를 덮어쓰는 것을 방지
+        video_count_stat = int(channel_info.get('statistics', {}).get('videoCount', '0'))
+        if video_count_stat > 0 and not processed_videos:
+            print("채널에 영상이 있지만 목록을 가져오지 못했습니다. API 할당량 초과일 수 있으므로 캐싱을 중단합니다.")
+            return None
+
+    return processed_videos
+
+def new_upload_videos(new_video_ids, video_details, etags=None, uploads_playlist_id=None):
+    """새 업로드 ID(최신순) 중 상세 정보를 받은 동영상의 항목 목록을 만듭니다.
+
+    증분 동기화(uploads_playlist_id 지정)에서 상세 정보를 받지 못한 ID가 있으면 업로드 재생목록 ETag를 지우고
+    그 ID보다 최신인 동영상도 이번에는 넣지 않습니다. 다음 증분 동기화는 이미 아는 동영상을 만나면 멈추므로,
+    이렇게 해야 304 응답이나 더 최신 동영상에 막히지 않고 빠진 동영상부터 다시 찾습니다.
+    """
+    if uploads_playlist_id:
+        missing = [index for index, video_id in enumerate(new_video_ids) if video_id not in video_details]
+        if missing:
+            print(f"새 동영상 {len(missing)}개의 상세 정보를 가져오지 못해 다음 동기화에서 다시 확인합니다.")
+            etags.pop(f"uploads:{uploads_playlist_id}", None)
+            new_video_ids = new_video_ids[missing[-1] + 1:]
+    return [{
+        "search_snippet": search_snippet_from_details(video_details[video_id]),
+        "details": video_details[video_id]
+    } for video_id in new_video_ids if video_details.get(video_id)]
+
+def stats_refresh_ids(videos):
+    """통계를 다시 가져올 기존 동영상 ID를 오래된 것부터 반환합니다.
+
+    오래된 순서로 50개씩 묶으면 새 업로드가 생겨도 앞 묶음의 구성(과 ETag 키)이 바뀌지 않습니다.
+    videos.list는 묶음당 1단위이므로 전체 동기화 없이도 적은 할당량으로 모든 동영상의 통계를 갱신합니다.
+    """
+    return [video['details']['id'] for video in reversed(videos)]
+
+def merge_video_details(videos, video_details):
+    """새로 가져온 상세 정보로 기존 동영상 목록을 갱신한 새 목록을 반환합니다.
+
+    요청이 실패해 결과에 없는 동영상과 바뀌지 않은(304) 동영상은 기존 항목을 그대로 두고,
+    200 응답에 없던 동영상(None, 삭제·비공개 전환)은 목록에서 뺍니다.
+    """
+    merged = []
+    for video in videos:
+        video_id = video['details']['id']
+        if video_id not in video_details:
+            merged.append(video)
+            continue
+        details = video_details[video_id]
+        if details is None:
+            continue
+        if details is video['details']:
+            merged.append(video)
+        else:
+            merged.append({"search_snippet": search_snippet_from_details(details), "details": details})
+    return merged
+
+def get_channel_info(etags=None, cached=None, channel_id=None):
+    """채널 기본 정보 가져오기 (cached가 있으면 조건부 요청, 304 응답 시 cached 반환)"""
+    channel_id = channel_id or CHANNEL_ID
+    url = f"https://www.googleapis.com/youtube/v3/channels"
+    params = {
+        'part': 'snippet,statistics,contentDetails',
+        'id': channel_id,
+        'fields': fields_param(CHANNEL_FIELDS),
+        'key': YOUTUBE_API_KEY
+    }
+    
+    try:
+        data = api_get(url, params, etags, f"channels:{channel_id}" if cached else None)  # 200번대 코드가 아니면 예외 발생
+        if data is None:
+            return cached
+        if data['items']:
+            return data['items'][0]
+    except requests.exceptions.RequestException as e:
+        # 콘솔에만 로그를 남김
+        print(f"채널 정보 API 오류: {e}")
+    
+    return None
+
+def get_videos():
+    """채널의 동영상 목록 가져오기"""
+    url = "https://www.googleapis.com/youtube/v3/search"
+    params = {
+        'part': 'snippet',
+        'channelId': CHANNEL_ID,
+        'order': 'date',
+        'type': 'video',
+        'maxResults': 20,
+        'key': YOUTUBE_API_KEY
+    }
+    
+    try:
+        return api_get(url, params)['items']
+    except requests.exceptions.RequestException as e:
+        print(f"동영상 목록을 가져오는 중 오류가 발생했습니다: {e}")
+    
+    return []
+
+def _get_video_details_batch(batch_ids, etags, cached_details, session):
+    """50개 이하 ID 한 묶음의 상세 정보를 가져옵니다.
+
+    200 응답에 없는 ID(삭제·비공개 전환)는 None으로 표시하고, 요청 오류 시에는 빈 딕셔너리를 반환합니다.
+    """
+    url = "https://www.googleapis.com/youtube/v3/videos"
+    params = {
+        'part': 'snippet,statistics,contentDetails',
+        'id': ','.join(batch_ids),
+        'fields': fields_param(VIDEO_FIELDS),
+        'key': YOUTUBE_API_KEY
+    }
+
+    etag_key = None
+    if all(video_id in cached_details for video_id in batch_ids):
+        etag_key = "videos:" + hashlib.sha1(params['id'].encode('utf-8')).hexdigest()
+
+    try:
+        data = api_get(url, params, etags, etag_key, session=session)
+        if data is None:
+            return {video_id: cached_details[video_id] for video_id in batch_ids}
+        details = dict.fromkeys(batch_ids)
+        details.update((item['id'], item) for item in data.get('items', []))
+        return details
+    except requests.exceptions.RequestException as e:
+        print(f"동영상 상세 정보 API 오류: {e}")
+        return {}
+
+def get_video_details(video_ids, etags=None, cached_details=None, max_workers=None):
+    """동영상 상세 정보 가져오기 (여러 ID 처리 및 contentDetails 포함)
+
+    50개씩 나눈 묶음을 최대 max_workers(기본 MAX_DETAIL_WORKERS)개 스레드로 동시에 요청하고,
+    결과는 요청 순서대로 합쳐 항상 같은 결과를 만듭니다.
+    cached_details에 배치의 모든 ID가 있으면 조건부 요청을 보내고, 304 응답이면 캐시된 상세 정보를 재사용합니다.
+    응답에 없는 ID(삭제·비공개 전환)의 값은 None이고, 요청이 실패한 묶음의 ID는 결과에 없습니다.
+    """
+    cached_details = cached_details or {}
+    details = {}
+
+    # YouTube API는 한 번에 50개의 ID만 조회 가능
+    batches = [video_ids[i:i+50] for i in range(0, len(video_ids), 50)]
+    if not batches:
+        return details
+
+    # 세션은 스크립트 스레드에서 꺼내 작업 스레드에 넘김 (작업 스레드에서는 Streamlit 캐시를 건드리지 않음)
+    session = get_http_session()
+    workers = max(1, min(max_workers or MAX_DETAIL_WORKERS, len(batches)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda batch: _get_video_details_batch(batch, etags, cached_details, session), batches)
+        for batch_details in results:
+            details.update(batch_details)
+
+    return details
+
+def iter_video_pages(etags=None, cached=None, session=None):
+    """채널 동영상 검색 결과를 페이지(최대 50개) 단위로 하나씩 내보내는 제너레이터입니다.
+
+    첫 페이지가 304이면 목록이 바뀌지 않은 것으로 보고 cached를 50개씩 나누어 내보냅니다.
+    API 오류는 호출한 쪽에서 처리하도록 그대로 전달합니다.
+    """
+    url = "https://www.googleapis.com/youtube/v3/search"
+    params = {
+        'part': 'snippet',
+        'channelId': CHANNEL_ID,
+        'order': 'date',
+        'type': 'video',
+        'maxResults': 50,
+        'fields': fields_param(SEARCH_ITEM_FIELDS, paged=True),
+        'key': YOUTUBE_API_KEY
+    }
+    
+    etag_key = f"search:{CHANNEL_ID}" if cached else None
+    while True:
+        data = api_get(url, params, etags, etag_key, session=session)
+        if data is None:
+            for i in range(0, len(cached), 50):
+                yield cached[i:i+50]
+            return
+        etag_key = None  # ETag는 첫 페이지에만 사용
+        yield data.get('items', [])
+        if 'nextPageToken' in data:
+            params['pageToken'] = data['nextPageToken']
+        else:
+            break
+
+def get_playlist_videos(playlist_id, etags=None, cached=None, session=None):
+    """플레이리스트 동영상 가져오기 (첫 페이지가 304이면 재생목록이 바뀌지 않은 것으로 보고 cached 반환)"""
+    url = "https://www.googleapis.com/youtube/v3/playlistItems"
+    videos = []
+    params = {
+        'part': 'snippet',
+        'playlistId': playlist_id,
+        'maxResults': 50,
+        'fields': fields_param(PLAYLIST_ITEM_FIELDS, paged=True),
+        'key': YOUTUBE_API_KEY
+    }
+    
+    try:
+        etag_key = f"playlistItems:{playlist_id}" if cached else None
+        while True:
+            data = api_get(url, params, etags, etag_key, session=session)
+            if data is None:
+                return cached
+            etag_key = None  # ETag는 첫 페이지에만 사용
+            videos.extend(data.get('items', []))
+            if 'nextPageToken' in data:
+                params['pageToken'] = data['nextPageToken']
+            else:
+                break
+        return videos
+    except requests.exceptions.RequestException as e:
+        print(f"플레이리스트 동영상을 가져오는 중 오류가 발생했습니다: {e}")
+        return []
+
+def get_new_uploads(playlist_id, known_ids, last_published_at=None, etags=None):
+    """업로드 재생목록을 최신순으로 훑어 아직 캐시에 없는 동영상 ID만 반환합니다.
+
+    이미 알고 있는 동영상을 만나거나 마지막 동기화 시각보다 오래된 동영상에 도달하면 즉시 멈춥니다.
+    첫 페이지가 304(변경 없음)이면 새 업로드가 없는 것이므로 바로 빈 목록을 반환합니다.
+    API 오류 시에는 None을 반환합니다.
+    """
+    url = "https://www.googleapis.com/youtube/v3/playlistItems"
+    new_ids = []
+    params = {
+        'part': 'contentDetails',
+        'playlistId': playlist_id,
+        'maxResults': 50,
+        'fields': fields_param(UPLOAD_ITEM_FIELDS, paged=True),
+        'key': YOUTUBE_API_KEY
+    }
+
+    try:
+        etag_key = f"uploads:{playlist_id}"
+        while True:
+            data = api_get(url, params, etags, etag_key)
+            if data is None:
+                return new_ids
+            etag_key = None  # ETag는 첫 페이지에만 사용
+            for item in data.get('items', []):
+                content_details = item.get('contentDetails', {})
+                video_id = content_details.get('videoId')
+                published_at = content_details.get('videoPublishedAt', '')
+                if video_id in known_ids:
+                    return new_ids
+                if last_published_at and published_at and published_at < last_published_at:
+                    return new_ids
+                if video_id:
+                    new_ids.append(video_id)
+            if 'nextPageToken' in data:
+                params['pageToken'] = data['nextPageToken']
+            else:
+                break
+        return new_ids
+    except requests.exceptions.RequestException as e:
+        print(f"업로드 재생목록을 가져오는 중 오류가 발생했습니다: {e}")
+        return None
+
+def main(argv=None):
+    """cron/systemd에서 실행하는 동기화 CLI 진입점입니다."""
+    parser = argparse.ArgumentParser(description="Haneul CCM 채널 데이터를 YouTube API와 동기화합니다.")
+    parser.add_argument("--full", action="store_true", help="search API로 전체 목록을 다시 가져옵니다.")
+    parser.add_argument("--force", action="store_true", help="캐시가 최신이어도 동기화합니다.")
+    parser.add_argument("--loop", action="store_true", help="종료하지 않고 --interval마다 반복 실행합니다.")
+    parser.add_argument("--interval", type=int, default=REFRESH_INTERVAL_HOURS * 3600, help="반복 주기 및 캐시 유효 시간(초)")
+    parser.add_argument("--quota", action="store_true", help="오늘의 API 할당량 사용 현황을 출력하고 종료합니다.")
+    args = parser.parse_args(argv)
+
+    if args.quota:
+        usage = quota_usage_today()
+        print(f"{quota_today()} (태평양 시간) 할당량 사용 현황")
+        for endpoint, units in sorted(usage.items()):
+            print(f"  {endpoint}: {units}")
+        print(f"  남은 할당량: {quota_remaining()} / {DAILY_QUOTA}")
+        return 0
+
+    if not YOUTUBE_API_KEY or not CHANNEL_ID:
+        print("YOUTUBE_API_KEY와 CHANNEL_ID를 환경 변수나 .streamlit/secrets.toml에 설정해주세요.")
+        return 2
+
+    if args.loop:
+        try:
+            run_refresh_loop(args.interval)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    max_age = timedelta(seconds=0) if args.force else timedelta(seconds=args.interval)
+    data = refresh_channel_data(full=args.full, wait=True, max_age=max_age)
+    if not data:
+        print("동기화에 실패했거나 다른 프로세스가 동기화 중입니다.")
+        return 1
+    print(f"동기화 완료: 동영상 {len(data.get('videos', []))}개, 마지막 업데이트 {data.get('last_updated')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())